@@ -1,7 +1,17 @@
-"""Entry point for dolores-assistant service."""
+"""Entry point for dolores-assistant service.
+
+Runs on uvloop + httptools (from uvicorn[standard]) where available; on
+platforms without uvloop (e.g. Windows dev machines) it falls back to asyncio.
+"""
 
 import uvicorn
 
+try:
+    import uvloop  # noqa: F401
+    _LOOP = "uvloop"
+except ImportError:
+    _LOOP = "asyncio"
+
 
 def main() -> None:
     uvicorn.run(
@@ -9,6 +19,9 @@ def main() -> None:
         host="0.0.0.0",
         port=8000,
         reload=False,
+        loop=_LOOP,
+        http="httptools",
+        ws="websockets",
     )
 
 
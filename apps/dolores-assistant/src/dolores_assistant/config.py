@@ -20,6 +20,7 @@ class AssistantConfig:
 
     # WebSocket
     max_session_seconds: int = get_env_int("MAX_SESSION_SECONDS", 300)
+    max_audio_bytes: int = get_env_int("MAX_AUDIO_BYTES", 25 * 1024 * 1024)
 
     # Defaults
     default_voice_id: str = get_env("DEFAULT_VOICE_ID", "default")
@@ -7,12 +7,14 @@ sentence-level TTS streaming, and the tool-calling agent loop.
 from __future__ import annotations
 
 import asyncio
-import json
-import re
+import io
 import os
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator, AsyncIterator
 
 import httpx
+import orjson
+import websockets
 
 from dolores_common.logging import get_logger
 
@@ -25,16 +27,92 @@ log = get_logger(__name__)
 _stt_semaphore = asyncio.Semaphore(1)
 _tts_semaphore = asyncio.Semaphore(1)
 
-# Sentence boundary regex for TTS chunking
-_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+# Cap on tool calls executed concurrently within one agent step
+_tool_semaphore = asyncio.Semaphore(8)
 
+# Sentence terminators for TTS chunking
+_TERMINATORS = ".!?"
 
-def _auth_headers() -> dict[str, str]:
-    """Build PSK auth headers for inter-service calls."""
-    psk = os.environ.get("DOLORES_SERVICE_PSK", "")
-    if psk:
-        return {"Authorization": f"Bearer {psk}"}
-    return {}
+# Shared connection pool for all downstream services
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+_CONNECT_TIMEOUT = 5.0
+
+# Per-service timeouts; connect is bounded separately so a dead host fails fast
+_STT_TIMEOUT = httpx.Timeout(settings.stt_timeout, connect=_CONNECT_TIMEOUT)
+_TTS_TIMEOUT = httpx.Timeout(settings.tts_timeout, connect=_CONNECT_TIMEOUT)
+_BRAIN_TIMEOUT = httpx.Timeout(settings.brain_timeout, connect=_CONNECT_TIMEOUT)
+_HEALTH_TIMEOUT = httpx.Timeout(2, connect=2)
+
+# STT streaming WebSocket (same host as the HTTP API)
+_STT_STREAM_URL = settings.stt_url.replace("http", "ws", 1) + "/v1/stream"
+
+# Failures of downstream calls that degrade gracefully; anything else is a bug
+# and propagates (as does cancellation, e.g. on WS disconnect)
+_CALL_ERRORS = (httpx.HTTPError, asyncio.TimeoutError, orjson.JSONDecodeError)
+
+# Health results are reused for this long so frequent probes don't fan out
+_HEALTH_CACHE_SECONDS = 2.0
+
+
+# PSK auth headers for inter-service calls, resolved once at process start
+_PSK = os.environ.get("DOLORES_SERVICE_PSK", "")
+_AUTH_HEADERS: dict[str, str] = {"Authorization": f"Bearer {_PSK}"} if _PSK else {}
+
+
+def _json(resp: httpx.Response) -> Any:
+    """Decode a JSON response body straight from bytes with orjson."""
+    return orjson.loads(resp.content)
+
+
+class _BufferReader:
+    """Read-only file-like view over a bytes-like buffer.
+
+    httpx only sends ``bytes`` inline; anything else is read as a file. This
+    lets a multipart upload stream chunks straight out of a ``bytearray``
+    instead of copying the whole buffer into ``bytes`` first.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size < 0 else min(self._pos + size, len(self._view))
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return chunk
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, min(base + offset, len(self._view)))
+        return self._pos
+
+    def close(self) -> None:
+        """Release the view so the underlying bytearray can be resized again."""
+        self._view.release()
+
+
+async def _iter_sse(resp: httpx.Response) -> AsyncGenerator[dict, None]:
+    """Yield decoded ``data:`` payloads from an SSE response.
+
+    Frames are split on raw bytes and parsed with orjson, so the stream is
+    never decoded to str line by line. Undecodable payloads are skipped.
+    """
+    buf = bytearray()
+    async for chunk in resp.aiter_bytes(chunk_size=8192):
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            if buf.startswith(b"data: ", start):
+                try:
+                    yield orjson.loads(memoryview(buf)[start + 6:end])
+                except orjson.JSONDecodeError:
+                    pass
+            start = end + 1
+        del buf[:start]
 
 
 class ServiceClient:
@@ -42,9 +120,31 @@ class ServiceClient:
 
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        self._health_cache: dict[str, tuple[float, str]] = {}
+        self._health_inflight: dict[str, asyncio.Task[str]] = {}
 
     async def start(self) -> None:
-        self._client = httpx.AsyncClient(headers=_auth_headers(), timeout=60)
+        self._client = httpx.AsyncClient(
+            headers=_AUTH_HEADERS,
+            http2=True,
+            limits=_POOL_LIMITS,
+            timeout=httpx.Timeout(60, connect=_CONNECT_TIMEOUT),
+        )
+        await self._warm_connections()
+
+    async def _warm_connections(self) -> None:
+        """Open pooled connections to downstream services ahead of the first request."""
+        async def _warm(url: str) -> None:
+            try:
+                await self.client.head(f"{url}/health", timeout=_HEALTH_TIMEOUT)
+            except httpx.HTTPError:
+                pass
+
+        await asyncio.gather(
+            _warm(settings.stt_url),
+            _warm(settings.tts_url),
+            _warm(settings.brain_url),
+        )
 
     async def close(self) -> None:
         if self._client:
@@ -58,20 +158,102 @@ class ServiceClient:
 
     # --- STT ---
 
-    async def transcribe(self, audio_data: bytes, content_type: str = "audio/webm") -> dict | None:
-        """Send audio to STT service. Returns transcription dict or None on failure."""
+    async def transcribe(
+        self, audio_data: bytes | bytearray | memoryview, content_type: str = "audio/webm"
+    ) -> dict | None:
+        """Send audio to STT service. Returns transcription dict or None on failure.
+
+        Non-``bytes`` buffers are uploaded in chunks, so the whole buffer is
+        never copied at once (each chunk still is); the caller may reuse them
+        once this returns.
+        """
+        upload = audio_data if isinstance(audio_data, bytes) else _BufferReader(audio_data)
         async with _stt_semaphore:
             try:
                 resp = await self.client.post(
                     f"{settings.stt_url}/v1/transcribe",
-                    files={"file": ("audio.webm", audio_data, content_type)},
-                    timeout=settings.stt_timeout,
+                    files={"file": ("audio.webm", upload, content_type)},
+                    timeout=_STT_TIMEOUT,
                 )
                 resp.raise_for_status()
-                return resp.json()
-            except Exception as e:
+                return _json(resp)
+            except httpx.HTTPStatusError as e:
+                log.error("stt_call_failed", status_code=e.response.status_code, error=str(e))
+                return None
+            except _CALL_ERRORS as e:
                 log.error("stt_call_failed", error=str(e))
                 return None
+            finally:
+                if isinstance(upload, _BufferReader):
+                    upload.close()
+
+    async def transcribe_stream(
+        self, chunks: AsyncIterator[bytes], language: str | None = None
+    ) -> AsyncGenerator[dict, None]:
+        """Stream audio to the STT WebSocket as it arrives. Yields STT stream messages.
+
+        Audio is uploaded while the caller is still receiving it, so only
+        inference remains once the utterance ends. If the stream can't be
+        opened or breaks, a single error message is yielded so the caller
+        can fall back to ``transcribe``.
+        """
+        end_msg: dict = {"type": "audio.end"}
+        if language:
+            end_msg["language"] = language
+
+        try:
+            async with websockets.connect(
+                _STT_STREAM_URL,
+                additional_headers=_AUTH_HEADERS,
+                open_timeout=_CONNECT_TIMEOUT,
+                max_size=None,
+            ) as ws:
+                # The STT slot is taken only for inference (audio.end until the
+                # final/error message), not while the user is still speaking
+                holding_slot = False
+
+                def _release_slot() -> None:
+                    nonlocal holding_slot
+                    if holding_slot:
+                        holding_slot = False
+                        _stt_semaphore.release()
+
+                async def _upload() -> None:
+                    nonlocal holding_slot
+                    try:
+                        async for chunk in chunks:
+                            await ws.send(chunk)
+                        await _stt_semaphore.acquire()
+                        holding_slot = True
+                        await ws.send(orjson.dumps(end_msg).decode())
+                    except Exception:
+                        # Unblock the receive loop below; the error is re-raised there
+                        await ws.close()
+                        raise
+
+                upload = asyncio.create_task(_upload())
+                try:
+                    async for raw in ws:
+                        msg = orjson.loads(raw)
+                        if msg.get("type") in ("final", "error"):
+                            _release_slot()
+                            yield msg
+                            return
+                        yield msg
+                    # The socket closed without a result; if the upload failed
+                    # (and closed it), it finishes promptly, so surface its error
+                    await asyncio.wait({upload}, timeout=_CONNECT_TIMEOUT)
+                    if upload.done():
+                        await upload
+                finally:
+                    if not upload.done():
+                        upload.cancel()
+                    elif not upload.cancelled():
+                        upload.exception()  # Retrieved; the result was already decided
+                    _release_slot()
+        except (OSError, asyncio.TimeoutError, websockets.WebSocketException, orjson.JSONDecodeError) as e:
+            log.error("stt_stream_failed", error=str(e))
+            yield {"type": "error", "text": "", "error": str(e)}
 
     # --- Brain ---
 
@@ -95,11 +277,14 @@ class ServiceClient:
             resp = await self.client.post(
                 f"{settings.brain_url}/v1/chat",
                 json=body,
-                timeout=settings.brain_timeout,
+                timeout=_BRAIN_TIMEOUT,
             )
             resp.raise_for_status()
-            return resp.json()
-        except Exception as e:
+            return _json(resp)
+        except httpx.HTTPStatusError as e:
+            log.error("brain_call_failed", status_code=e.response.status_code, error=str(e))
+            return None
+        except _CALL_ERRORS as e:
             log.error("brain_call_failed", error=str(e))
             return None
 
@@ -124,19 +309,41 @@ class ServiceClient:
                 "POST",
                 f"{settings.brain_url}/v1/chat/stream",
                 json=body,
-                timeout=settings.brain_timeout,
+                timeout=_BRAIN_TIMEOUT,
             ) as resp:
                 resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    if line.startswith("data: "):
-                        try:
-                            yield json.loads(line[6:])
-                        except json.JSONDecodeError:
-                            continue
-        except Exception as e:
+                async for event in _iter_sse(resp):
+                    yield event
+        except _CALL_ERRORS as e:
             log.error("brain_stream_failed", error=str(e))
             yield {"type": "error", "error": str(e)}
 
+    async def chat_stream_raw(
+        self,
+        message: str,
+        conversation_id: str | None = None,
+        provider: str | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Relay Brain's SSE stream as raw bytes, without parsing the events."""
+        body = {
+            "message": message,
+            "conversation_id": conversation_id,
+            "provider": provider or settings.default_provider,
+        }
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{settings.brain_url}/v1/chat/stream",
+                json=body,
+                timeout=_BRAIN_TIMEOUT,
+            ) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes():
+                    yield chunk
+        except _CALL_ERRORS as e:
+            log.error("brain_stream_failed", error=str(e))
+            yield b"data: " + orjson.dumps({"type": "error", "error": str(e)}) + b"\n\n"
+
     # --- TTS ---
 
     async def synthesize(
@@ -148,25 +355,43 @@ class ServiceClient:
                 resp = await self.client.post(
                     f"{settings.tts_url}/v1/synthesize",
                     json={"text": text, "voice_id": voice_id},
-                    timeout=settings.tts_timeout,
+                    timeout=_TTS_TIMEOUT,
                 )
                 resp.raise_for_status()
                 return resp.content
-            except Exception as e:
+            except _CALL_ERRORS as e:
                 log.error("tts_call_failed", error=str(e))
                 return None
 
     # --- Health checks ---
 
     async def check_service(self, name: str, url: str) -> str:
-        """Check health of a downstream service. Returns 'healthy' or 'unhealthy'."""
+        """Check health of a downstream service. Returns 'healthy' or 'unhealthy'.
+
+        Results are cached briefly, and concurrent checks of the same service
+        share a single in-flight request.
+        """
+        cached = self._health_cache.get(url)
+        if cached and time.monotonic() - cached[0] < _HEALTH_CACHE_SECONDS:
+            return cached[1]
+
+        task = self._health_inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._probe_health(url))
+            self._health_inflight[url] = task
+            task.add_done_callback(lambda _: self._health_inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def _probe_health(self, url: str) -> str:
+        status = "unhealthy"
         try:
-            resp = await self.client.get(f"{url}/health", timeout=2)
+            resp = await self.client.get(f"{url}/health", timeout=_HEALTH_TIMEOUT)
             if resp.status_code == 200:
-                return "healthy"
-        except Exception:
+                status = "healthy"
+        except _CALL_ERRORS:
             pass
-        return "unhealthy"
+        self._health_cache[url] = (time.monotonic(), status)
+        return status
 
     async def check_all_services(self) -> dict[str, str]:
         """Check health of all downstream services."""
@@ -178,10 +403,65 @@ class ServiceClient:
         return {"stt": stt, "tts": tts, "brain": brain}
 
 
-def split_sentences(text: str) -> list[str]:
-    """Split text at sentence boundaries for progressive TTS."""
-    sentences = _SENTENCE_RE.split(text)
-    return [s.strip() for s in sentences if s.strip()]
+def iter_new_sentences(buf: str, start_idx: int) -> tuple[list[str], int]:
+    """Extract the sentences completed in a growing buffer since ``start_idx``.
+
+    A sentence ends at a run of ``.!?`` followed by whitespace. Only text
+    from ``start_idx`` on is scanned, using ``str.find`` rather than
+    re-splitting the whole buffer on every token.
+    Returns the completed sentences and the index where the unfinished
+    remainder starts, to be passed back in on the next call.
+    """
+    sentences: list[str] = []
+    end = len(buf)
+    scan = start_idx
+    next_hit = {c: buf.find(c, scan) for c in _TERMINATORS}
+
+    while True:
+        hits = [i for i in next_hit.values() if i != -1]
+        if not hits:
+            break
+
+        # Step over the whole run of terminators ("...", "?!")
+        i = min(hits) + 1
+        while i < end and buf[i] in _TERMINATORS:
+            i += 1
+        if i == end:
+            break  # can't tell yet whether whitespace follows
+
+        if buf[i].isspace():
+            sentence = buf[start_idx:i].strip()
+            if sentence:
+                sentences.append(sentence)
+            while i < end and buf[i].isspace():
+                i += 1
+            start_idx = i
+        scan = i
+
+        for c, pos in next_hit.items():
+            if pos != -1 and pos < scan:
+                next_hit[c] = buf.find(c, scan)
+
+    return sentences, start_idx
+
+
+async def _run_tool_call(tc: dict) -> str:
+    """Execute a single tool call and format its result for the LLM."""
+    fn = tc.get("function", {})
+    tool_name = fn.get("name", "")
+
+    tool = get_tool_by_name(tool_name)
+    if not tool:
+        return f"[{tool_name}]: Unknown tool: {tool_name}"
+
+    async with _tool_semaphore:
+        try:
+            tool_args = orjson.loads(fn.get("arguments", "{}"))
+            tool_result = await tool.execute(**tool_args)
+        except Exception as e:
+            tool_result = f"Error executing {tool_name}: {e}"
+
+    return f"[{tool_name}]: {tool_result}"
 
 
 async def run_tool_loop(
@@ -216,23 +496,8 @@ async def run_tool_loop(
         if not result.get("tool_calls"):
             return result
 
-        # Execute tools and collect results
-        tool_results = []
-        for tc in result["tool_calls"]:
-            fn = tc.get("function", {})
-            tool_name = fn.get("name", "")
-            tool_args = json.loads(fn.get("arguments", "{}"))
-
-            tool = get_tool_by_name(tool_name)
-            if tool:
-                try:
-                    tool_result = await tool.execute(**tool_args)
-                except Exception as e:
-                    tool_result = f"Error executing {tool_name}: {e}"
-            else:
-                tool_result = f"Unknown tool: {tool_name}"
-
-            tool_results.append(f"[{tool_name}]: {tool_result}")
+        # Execute tools concurrently; results keep the order of the calls
+        tool_results = await asyncio.gather(*(_run_tool_call(tc) for tc in result["tool_calls"]))
 
         # Send tool results back as a new message
         message = "\n".join(tool_results)
@@ -1,17 +1,21 @@
-"""Assistant API routes: WS /v1/conversation, POST /v1/chat."""
+"""Assistant API routes: WS /v1/conversation, POST /v1/chat, POST /v1/chat/stream."""
 
 from __future__ import annotations
 
-import json
+import asyncio
 import uuid
+from contextlib import aclosing
+from typing import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 
 from dolores_common.auth import ClientAPIKey, validate_ws_token
 from dolores_common.logging import get_logger
 
 from .config import settings
-from .pipeline import ServiceClient, run_tool_loop, split_sentences
+from .pipeline import ServiceClient, run_tool_loop, iter_new_sentences
 from .schemas import TextChatRequest, TextChatResponse
 
 log = get_logger(__name__)
@@ -20,6 +24,13 @@ router = APIRouter(prefix="/v1", tags=["assistant"])
 
 _service_client: ServiceClient | None = None
 
+# Token coalescing: tokens arriving within this window are sent as one frame
+_TOKEN_FLUSH_SECONDS = 0.005
+_TOKEN_FLUSH_CHARS = 256
+
+# Marker for "no event buffered, fetch the next one"
+_NEXT: dict = {}
+
 
 def get_service_client() -> ServiceClient:
     if _service_client is None:
@@ -32,6 +43,11 @@ def set_service_client(client: ServiceClient) -> None:
     _service_client = client
 
 
+async def _send(websocket: WebSocket, obj: dict) -> None:
+    """Send a JSON event as a text frame (binary frames carry audio)."""
+    await websocket.send_text(orjson.dumps(obj).decode())
+
+
 @router.post("/chat", response_model=TextChatResponse)
 async def text_chat(
     req: TextChatRequest,
@@ -52,6 +68,28 @@ async def text_chat(
     )
 
 
+@router.post("/chat/stream")
+async def text_chat_stream(
+    req: TextChatRequest,
+    _auth: ClientAPIKey = None,
+    client: ServiceClient = Depends(get_service_client),
+) -> StreamingResponse:
+    """Text-only streaming chat via SSE.
+
+    Brain's event stream is relayed byte-for-byte, so events are never
+    decoded and re-encoded here. Tools are not offered on this path.
+    """
+    return StreamingResponse(
+        client.chat_stream_raw(
+            message=req.message,
+            conversation_id=req.conversation_id,
+            provider=req.provider,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.websocket("/conversation")
 async def conversation_ws(websocket: WebSocket) -> None:
     """Full-duplex WebSocket for voice + text conversation.
@@ -78,7 +116,7 @@ async def conversation_ws(websocket: WebSocket) -> None:
 
     client = _service_client
     if client is None:
-        await websocket.send_json({"type": "error", "code": "service_unavailable", "message": "Service not ready"})
+        await _send(websocket, {"type": "error", "code": "service_unavailable", "message": "Service not ready"})
         await websocket.close()
         return
 
@@ -88,14 +126,24 @@ async def conversation_ws(websocket: WebSocket) -> None:
     provider = settings.default_provider
     mode = "both"
     audio_buffer = bytearray()
+    audio_overflow = False
+    # Live STT upload for the current utterance, started on audio.start
+    stt_chunks: asyncio.Queue[bytes | None] | None = None
+    stt_task: asyncio.Task[dict | None] | None = None
+
+    def _stop_stt() -> None:
+        nonlocal stt_chunks, stt_task
+        if stt_task is not None:
+            stt_task.cancel()
+        stt_chunks = stt_task = None
 
     try:
         # Wait for session.start
         raw = await websocket.receive_text()
-        msg = json.loads(raw)
+        msg = orjson.loads(raw)
 
         if msg.get("type") != "session.start":
-            await websocket.send_json({"type": "error", "code": "protocol_error", "message": "Expected session.start"})
+            await _send(websocket, {"type": "error", "code": "protocol_error", "message": "Expected session.start"})
             await websocket.close()
             return
 
@@ -107,7 +155,7 @@ async def conversation_ws(websocket: WebSocket) -> None:
         mode = msg.get("mode", mode)
         conversation_id = msg.get("conversation_id")
 
-        await websocket.send_json({
+        await _send(websocket, {
             "type": "session.created",
             "session_id": session_id,
             "conversation_id": conversation_id or "",
@@ -116,37 +164,71 @@ async def conversation_ws(websocket: WebSocket) -> None:
         log.info("session_started", session_id=session_id, mode=mode, provider=provider)
 
         # Main message loop
+        pending: dict | None = None
         while True:
-            message = await websocket.receive()
+            message = pending if pending is not None else await websocket.receive()
+            pending = None
 
             if "bytes" in message:
-                # Accumulate audio chunks
-                audio_buffer.extend(message["bytes"])
+                # Pick up audio frames already queued behind this one in a single pass
+                chunks, pending = await _drain_audio(websocket, message["bytes"], settings.max_audio_bytes)
+
+                # Accumulate audio chunks, dropping the rest of an oversize utterance
+                for chunk in chunks:
+                    if audio_overflow:
+                        break
+                    if len(audio_buffer) + len(chunk) > settings.max_audio_bytes:
+                        audio_overflow = True
+                        audio_buffer.clear()
+                        _stop_stt()
+                        await _send(websocket, {
+                            "type": "error",
+                            "code": "audio_too_large",
+                            "message": f"Audio exceeds {settings.max_audio_bytes} bytes",
+                        })
+                        break
+                    audio_buffer.extend(chunk)
+                    if stt_chunks is not None:
+                        stt_chunks.put_nowait(chunk)
                 continue
 
             if "text" not in message:
                 continue
 
-            data = json.loads(message["text"])
+            data = orjson.loads(message["text"])
             msg_type = data.get("type", "")
 
             if msg_type == "session.end":
                 break
 
             elif msg_type == "audio.start":
-                audio_buffer = bytearray()
+                audio_buffer.clear()
+                audio_overflow = False
+                _stop_stt()
+                stt_chunks = asyncio.Queue()
+                stt_task = asyncio.create_task(_stream_stt(websocket, client, stt_chunks))
 
             elif msg_type == "audio.end":
+                if audio_overflow:
+                    audio_overflow = False
+                    continue
                 if not audio_buffer:
-                    await websocket.send_json({"type": "error", "code": "no_audio", "message": "No audio data received"})
+                    _stop_stt()
+                    await _send(websocket, {"type": "error", "code": "no_audio", "message": "No audio data received"})
                     continue
 
-                # STT
-                transcription = await client.transcribe(bytes(audio_buffer))
-                audio_buffer = bytearray()
+                # STT: finish the live upload, falling back to a batch upload
+                transcription = None
+                if stt_task is not None:
+                    stt_chunks.put_nowait(None)
+                    transcription = await stt_task
+                    stt_chunks = stt_task = None
+                if transcription is None:
+                    transcription = await client.transcribe(audio_buffer)
+                audio_buffer.clear()
 
                 if transcription is None:
-                    await websocket.send_json({
+                    await _send(websocket, {
                         "type": "error",
                         "code": "stt_unavailable",
                         "message": "Speech recognition failed, please type instead",
@@ -154,7 +236,7 @@ async def conversation_ws(websocket: WebSocket) -> None:
                     continue
 
                 user_text = transcription.get("text", "")
-                await websocket.send_json({"type": "transcription.final", "text": user_text})
+                await _send(websocket, {"type": "transcription.final", "text": user_text})
 
                 if not user_text.strip():
                     continue
@@ -178,9 +260,64 @@ async def conversation_ws(websocket: WebSocket) -> None:
     except Exception as e:
         log.error("ws_error", session_id=session_id, error=str(e))
         try:
-            await websocket.send_json({"type": "error", "code": "internal_error", "message": str(e)})
+            await _send(websocket, {"type": "error", "code": "internal_error", "message": str(e)})
         except Exception:
             pass
+    finally:
+        _stop_stt()
+
+
+async def _drain_audio(
+    websocket: WebSocket, first: bytes, max_bytes: int
+) -> tuple[list[bytes], dict | None]:
+    """Collect audio frames already queued behind ``first`` without waiting for more.
+
+    Stops once ``max_bytes`` have been collected. Returns the audio chunks and
+    the first non-audio message, if one was read while draining.
+    """
+    chunks = [first]
+    size = len(first)
+    while size <= max_bytes:
+        # Give the receive a single loop iteration: it only completes if a frame
+        # is already queued. (wait_for with a zero timeout never even starts it.)
+        receive = asyncio.ensure_future(websocket.receive())
+        await asyncio.sleep(0)
+        if not receive.done():
+            receive.cancel()
+            break
+        message = receive.result()
+        if "bytes" not in message:
+            return chunks, message
+        chunks.append(message["bytes"])
+        size += len(message["bytes"])
+    return chunks, None
+
+
+async def _stream_stt(
+    websocket: WebSocket,
+    client: ServiceClient,
+    chunks: asyncio.Queue[bytes | None],
+) -> dict | None:
+    """Upload queued audio to STT while the user speaks, relaying partial transcripts.
+
+    Returns the final transcription, or None if streaming failed and the
+    caller should fall back to a batch upload.
+    """
+    async def _audio() -> AsyncGenerator[bytes, None]:
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+
+    result = None
+    stream = client.transcribe_stream(_audio())
+    async with aclosing(stream):
+        # The stream ends on its own after a final or error message
+        async for event in stream:
+            etype = event.get("type")
+            if etype == "partial":
+                await _send(websocket, {"type": "transcription.partial", "text": event.get("text", "")})
+            elif etype == "final":
+                result = {"text": event.get("text", ""), "language": event.get("language", "")}
+    return result
 
 
 async def _process_and_respond(
@@ -192,36 +329,130 @@ async def _process_and_respond(
     voice_id: str,
     mode: str,
 ) -> None:
-    """Send user text to brain, stream response text, and optionally TTS audio."""
+    """Send user text to brain, stream response text, and optionally TTS audio.
+
+    TTS is pipelined against the brain stream: each sentence is handed to the
+    TTS service as soon as it is complete, and the audio is sent back in order
+    while further tokens are still arriving.
+    """
     full_text = ""
+    done_text: str | None = None
+    spoken_idx = 0
+    speak = mode != "text"
+    audio_queue: asyncio.Queue[asyncio.Task | None] = asyncio.Queue()
+    sender = asyncio.create_task(_send_audio(websocket, audio_queue)) if speak else None
 
-    async for event in client.chat_stream(
+    def _speak(sentence: str) -> None:
+        audio_queue.put_nowait(asyncio.create_task(client.synthesize(sentence, voice_id=voice_id)))
+
+    stream = _coalesce_tokens(client.chat_stream(
         message=user_text,
         conversation_id=conversation_id,
         provider=provider,
-    ):
-        if event.get("type") == "token":
-            content = event.get("content", "")
-            full_text += content
-            await websocket.send_json({"type": "response.text", "content": content})
-
-        elif event.get("type") == "done":
-            full_text = event.get("content", full_text)
-
-        elif event.get("type") == "error":
-            await websocket.send_json({
-                "type": "error",
-                "code": "brain_error",
-                "message": event.get("error", "Unknown error"),
-            })
-            return
+    ))
 
-    # TTS: synthesize sentences and send audio
-    if mode != "text" and full_text.strip():
-        sentences = split_sentences(full_text)
-        for sentence in sentences:
-            audio = await client.synthesize(sentence, voice_id=voice_id)
-            if audio:
-                await websocket.send_bytes(audio)
+    try:
+        async with aclosing(stream):
+            async for event in stream:
+                etype = event.get("type")
+                if etype == "token":
+                    content = event.get("content", "")
+                    full_text += content
+                    await _send(websocket, {"type": "response.text", "content": content})
+
+                    if speak:
+                        sentences, spoken_idx = iter_new_sentences(full_text, spoken_idx)
+                        for sentence in sentences:
+                            _speak(sentence)
+
+                elif etype == "done":
+                    done_text = event.get("content")
+
+                elif etype == "error":
+                    await _send(websocket, {
+                        "type": "error",
+                        "code": "brain_error",
+                        "message": event.get("error", "Unknown error"),
+                    })
+                    return
+
+        # Flush the trailing sentence and wait for all audio to be sent
+        if sender is not None:
+            if full_text[spoken_idx:].strip():
+                _speak(full_text[spoken_idx:].strip())
+            audio_queue.put_nowait(None)
+            await sender
+            sender = None
+    finally:
+        if sender is not None:
+            sender.cancel()
+            while not audio_queue.empty():
+                task = audio_queue.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+    if done_text is not None:
+        full_text = done_text
+    await _send(websocket, {"type": "response.end", "full_text": full_text})
+
+
+async def _send_audio(websocket: WebSocket, audio_queue: asyncio.Queue[asyncio.Task | None]) -> None:
+    """Await queued TTS tasks in order and forward their audio until a None sentinel."""
+    while (task := await audio_queue.get()) is not None:
+        audio = await task
+        if audio:
+            await websocket.send_bytes(audio)
+
+
+async def _coalesce_tokens(events: AsyncGenerator[dict, None]) -> AsyncGenerator[dict, None]:
+    """Merge token events that arrive in quick succession into a single event.
+
+    The first token of a burst opens a short window; tokens arriving within it
+    (up to a size cap) are joined, so high token rates cost one frame per burst
+    instead of one per token. Non-token events pass through unchanged.
+    """
+    queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+    async def _pump() -> None:
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(None)
+
+    pump = asyncio.create_task(_pump())
+    loop = asyncio.get_running_loop()
+    try:
+        event = await queue.get()
+        while event is not None:
+            if event.get("type") != "token":
+                yield event
+                event = await queue.get()
+                continue
 
-    await websocket.send_json({"type": "response.end", "full_text": full_text})
+            parts = [event.get("content", "")]
+            size = len(parts[0])
+            deadline = loop.time() + _TOKEN_FLUSH_SECONDS
+            event = _NEXT
+            while size < _TOKEN_FLUSH_CHARS:
+                try:
+                    event = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    event = _NEXT
+                    break
+                if event is None or event.get("type") != "token":
+                    break
+                parts.append(event.get("content", ""))
+                size += len(parts[-1])
+                event = _NEXT
+
+            yield {"type": "token", "content": "".join(parts)}
+            if event is _NEXT:
+                event = await queue.get()
+        # Re-raise an upstream failure instead of ending as if the stream completed
+        await pump
+    finally:
+        if not pump.done():
+            pump.cancel()
+        elif not pump.cancelled():
+            pump.exception()  # Retrieved; the consumer stopped early
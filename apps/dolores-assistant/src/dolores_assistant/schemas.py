@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TextChatRequest(BaseModel):
     """POST /v1/chat request body."""
+    model_config = ConfigDict(extra="ignore")
+
     message: str
     conversation_id: str | None = None
     provider: str | None = None
@@ -16,6 +18,8 @@ class TextChatRequest(BaseModel):
 
 class TextChatResponse(BaseModel):
     """POST /v1/chat response body."""
+    model_config = ConfigDict(extra="ignore")
+
     message: str
     conversation_id: str
 
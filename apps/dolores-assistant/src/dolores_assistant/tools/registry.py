@@ -11,15 +11,24 @@ from .base import Tool
 
 TOOLS: list[Tool] = []
 
+# Precomputed at import time; kept in sync by register()
+_TOOL_BY_NAME: dict[str, Tool] = {tool.name: tool for tool in TOOLS}
+_TOOL_DEFS: tuple[dict, ...] = tuple(tool.to_openai_function() for tool in TOOLS)
+
+
+def register(tool: Tool) -> None:
+    """Register a tool at runtime, replacing any tool with the same name."""
+    global _TOOL_DEFS
+    TOOLS[:] = [t for t in TOOLS if t.name != tool.name] + [tool]
+    _TOOL_BY_NAME[tool.name] = tool
+    _TOOL_DEFS = tuple(t.to_openai_function() for t in TOOLS)
+
 
 def get_tool_definitions() -> list[dict]:
     """Get OpenAI function-calling format definitions for all tools."""
-    return [tool.to_openai_function() for tool in TOOLS]
+    return list(_TOOL_DEFS)
 
 
 def get_tool_by_name(name: str) -> Tool | None:
     """Look up a tool by name."""
-    for tool in TOOLS:
-        if tool.name == name:
-            return tool
-    return None
+    return _TOOL_BY_NAME.get(name)
@@ -0,0 +1,97 @@
+"""Exact-match LLM response cache (in-process LRU, or Redis when configured)."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+
+import orjson
+
+from dolores_common.logging import get_logger
+
+log = get_logger(__name__)
+
+_KEY_PREFIX = "dolores:brain:cache:"
+
+
+def cache_key(model: str, messages: list[dict], temperature: float, max_tokens: int) -> str:
+    """Hash the normalized request that determines the completion."""
+    raw = orjson.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ResponseCache:
+    """TTL cache for completed assistant responses.
+
+    Uses Redis when ``redis_url`` is set (requires the ``redis`` extra), so
+    entries are shared across replicas; otherwise keeps a bounded LRU in memory.
+    """
+
+    def __init__(self, ttl: int, max_entries: int = 1024, redis_url: str = "") -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._redis_url = redis_url
+        self._redis = None
+        self._local: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    async def init(self) -> None:
+        if not self.enabled or not self._redis_url:
+            log.info("response_cache_ready", backend="memory", ttl=self._ttl)
+            return
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self._redis_url)
+        log.info("response_cache_ready", backend="redis", ttl=self._ttl)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(_KEY_PREFIX + key)
+            except Exception as e:
+                log.warning("cache_get_failed", error=str(e))
+                return None
+        else:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires, raw = entry
+            if expires < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, payload: dict) -> None:
+        if not self.enabled:
+            return
+        raw = orjson.dumps(payload)
+        if self._redis is not None:
+            try:
+                await self._redis.setex(_KEY_PREFIX + key, self._ttl, raw)
+            except Exception as e:
+                log.warning("cache_set_failed", error=str(e))
+            return
+        self._local[key] = (time.monotonic() + self._ttl, raw)
+        self._local.move_to_end(key)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
@@ -23,8 +23,20 @@ class BrainConfig:
     max_tokens: int = get_env_int("DEFAULT_MAX_TOKENS", 1024)
     temperature: float = float(get_env("DEFAULT_TEMPERATURE", "0.7"))
 
+    # Response cache (exact match); 0 disables, empty Redis URL = in-process
+    cache_ttl: int = get_env_int("BRAIN_CACHE_TTL", 300)
+    cache_max_entries: int = get_env_int("BRAIN_CACHE_MAX_ENTRIES", 1024)
+    cache_max_temperature: float = float(get_env("BRAIN_CACHE_MAX_TEMPERATURE", "0.3"))
+    cache_redis_url: str = get_env("BRAIN_CACHE_REDIS_URL", "")
+
+    # SSE token batching for /v1/chat/stream (flush on whichever comes first)
+    sse_flush_bytes: int = get_env_int("SSE_FLUSH_BYTES", 64)
+    sse_flush_ms: int = get_env_int("SSE_FLUSH_MS", 15)
+
     # SQLite for conversations
     db_path: str = get_env("BRAIN_DB_PATH", "data/conversations.db")
+    history_cache_size: int = get_env_int("BRAIN_HISTORY_CACHE_SIZE", 256)
+    max_history_messages: int = get_env_int("BRAIN_MAX_HISTORY_MESSAGES", 0)  # 0 = unlimited
 
     # Logging
     log_level: str = get_env("LOG_LEVEL", "INFO")
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 import aiosqlite
+import orjson
 
 from dolores_common.logging import get_logger
 
@@ -38,12 +41,31 @@ CREATE INDEX IF NOT EXISTS idx_messages_conv ON messages(conversation_id);
 """
 
 
+def _copy_messages(messages: list[dict]) -> list[dict]:
+    copies = []
+    for m in messages:
+        m = dict(m)
+        if "tool_calls" in m:
+            m["tool_calls"] = copy.deepcopy(m["tool_calls"])
+        copies.append(m)
+    return copies
+
+
 class ConversationStore:
-    """Async SQLite store for conversation history."""
+    """Async SQLite store for conversation history.
+
+    Recently used histories are kept in an in-process LRU so multi-turn
+    conversations don't re-read every message from SQLite on each turn.
+    ``append`` is the only writer and updates cached entries in place.
+    """
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, history_cache_size: int = 256) -> None:
         self._db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        self._history_cache_size = history_cache_size
+        self._history: OrderedDict[str, list[dict]] = OrderedDict()
+        # Orders cache fills against appends so a fill never misses or repeats a row
+        self._history_lock = asyncio.Lock()
 
     async def init(self) -> None:
         """Open the database and create tables."""
@@ -67,6 +89,7 @@ class ConversationStore:
             (cid, now, now),
         )
         await self._db.commit()
+        self._cache_history(cid, [])
         return cid
 
     async def append(
@@ -78,6 +101,25 @@ class ConversationStore:
         tool_calls: list[dict] | None = None,
     ) -> None:
         """Append a message to a conversation."""
+        async with self._history_lock:
+            await self._insert_message(conversation_id, role, content, tool_call_id, tool_calls)
+            cached = self._history.get(conversation_id)
+            if cached is not None:
+                msg: dict = {"role": role, "content": content}
+                if tool_call_id:
+                    msg["tool_call_id"] = tool_call_id
+                if tool_calls:
+                    msg["tool_calls"] = tool_calls
+                cached.append(msg)
+
+    async def _insert_message(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        tool_call_id: str | None,
+        tool_calls: list[dict] | None,
+    ) -> None:
         now = datetime.now(timezone.utc).isoformat()
         await self._db.execute(
             "INSERT INTO messages (conversation_id, role, content, tool_call_id, tool_calls, created_at) "
@@ -87,7 +129,7 @@ class ConversationStore:
                 role,
                 content,
                 tool_call_id,
-                json.dumps(tool_calls) if tool_calls else None,
+                orjson.dumps(tool_calls).decode() if tool_calls else None,
                 now,
             ),
         )
@@ -98,7 +140,24 @@ class ConversationStore:
         await self._db.commit()
 
     async def get_history(self, conversation_id: str) -> list[dict]:
-        """Get all messages for a conversation in order."""
+        """Get all messages for a conversation in order.
+
+        Returns copies of the cached messages, since callers (and litellm)
+        may modify them.
+        """
+        cached = self._history.get(conversation_id)
+        if cached is not None:
+            self._history.move_to_end(conversation_id)
+            return _copy_messages(cached)
+
+        async with self._history_lock:
+            cached = self._history.get(conversation_id)
+            if cached is None:
+                cached = await self._load_history(conversation_id)
+                self._cache_history(conversation_id, cached)
+        return _copy_messages(cached)
+
+    async def _load_history(self, conversation_id: str) -> list[dict]:
         cursor = await self._db.execute(
             "SELECT role, content, tool_call_id, tool_calls FROM messages "
             "WHERE conversation_id = ? ORDER BY id",
@@ -111,17 +170,27 @@ class ConversationStore:
             if tool_call_id:
                 msg["tool_call_id"] = tool_call_id
             if tool_calls_json:
-                msg["tool_calls"] = json.loads(tool_calls_json)
+                msg["tool_calls"] = orjson.loads(tool_calls_json)
             messages.append(msg)
         return messages
 
     async def exists(self, conversation_id: str) -> bool:
         """Check if a conversation exists."""
+        if conversation_id in self._history:
+            return True
         cursor = await self._db.execute(
             "SELECT 1 FROM conversations WHERE id = ?", (conversation_id,)
         )
         return await cursor.fetchone() is not None
 
+    def _cache_history(self, conversation_id: str, messages: list[dict]) -> None:
+        if self._history_cache_size <= 0:
+            return
+        self._history[conversation_id] = messages
+        self._history.move_to_end(conversation_id)
+        while len(self._history) > self._history_cache_size:
+            self._history.popitem(last=False)
+
     async def list_conversations(self, limit: int = 50) -> list[dict]:
         """List recent conversations."""
         cursor = await self._db.execute(
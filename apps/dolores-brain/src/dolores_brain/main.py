@@ -11,12 +11,14 @@ from dolores_common.health import create_health_router
 from dolores_common.logging import setup_logging
 from dolores_common.middleware import add_common_middleware
 
+from .cache import ResponseCache
 from .config import settings
 from .conversation import ConversationStore
 from .provider_config import PROVIDERS, setup_providers
-from .routes import router as brain_router, set_store
+from .routes import router as brain_router, set_cache, set_store
 
-_store = ConversationStore(settings.db_path)
+_store = ConversationStore(settings.db_path, settings.history_cache_size)
+_cache = ResponseCache(settings.cache_ttl, settings.cache_max_entries, settings.cache_redis_url)
 
 
 @asynccontextmanager
@@ -29,7 +31,10 @@ async def lifespan(app: FastAPI):
     setup_providers()
     await _store.init()
     set_store(_store)
+    await _cache.init()
+    set_cache(_cache)
     yield
+    await _cache.close()
     await _store.close()
 
 
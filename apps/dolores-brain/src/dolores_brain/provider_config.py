@@ -6,8 +6,11 @@ correct providers. No custom provider abstraction — LiteLLM handles that.
 
 from __future__ import annotations
 
+import functools
 import os
 
+import orjson
+
 from dolores_common.logging import get_logger
 
 from .config import settings
@@ -16,9 +19,13 @@ log = get_logger(__name__)
 
 PROVIDERS: dict[str, dict] = {}
 
+# Serialized GET /v1/providers body, rebuilt by setup_providers()
+_PROVIDERS_JSON: bytes = b"[]"
+
 
 def setup_providers() -> dict[str, dict]:
     """Configure LiteLLM environment variables and return available providers."""
+    global _PROVIDERS_JSON
     # Clear and update in-place so references from other modules stay valid
     PROVIDERS.clear()
 
@@ -55,9 +62,23 @@ def setup_providers() -> dict[str, dict]:
         }
         log.info("provider_configured", provider="openai")
 
+    _PROVIDERS_JSON = orjson.dumps(
+        [
+            {"name": info["name"], "models": info["models"], "default_model": info["default_model"]}
+            for info in PROVIDERS.values()
+        ]
+    )
+    # Drop model strings resolved against the previous provider set
+    resolve_model.cache_clear()
     return PROVIDERS
 
 
+def providers_json() -> bytes:
+    """Return the pre-serialized provider list."""
+    return _PROVIDERS_JSON
+
+
+@functools.lru_cache(maxsize=64)
 def resolve_model(provider: str | None, model: str | None) -> str:
     """Resolve the LiteLLM model string from provider/model inputs.
 
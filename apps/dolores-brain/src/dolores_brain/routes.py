@@ -2,19 +2,21 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import time
 
 import litellm
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from dolores_common.auth import ServicePSK
 from dolores_common.logging import get_logger
 
+from .cache import ResponseCache, cache_key
 from .config import settings
 from .conversation import ConversationStore
-from .provider_config import PROVIDERS, resolve_model
+from .provider_config import providers_json, resolve_model
 from .schemas import ChatRequest, ChatResponse, ProviderInfo
 
 log = get_logger(__name__)
@@ -22,6 +24,9 @@ log = get_logger(__name__)
 router = APIRouter(prefix="/v1", tags=["brain"])
 
 _store: ConversationStore | None = None
+_cache: ResponseCache | None = None
+# Cache key -> in-flight completion shared by identical concurrent requests
+_inflight: dict[str, asyncio.Task] = {}
 
 DEFAULT_SYSTEM_PROMPT = (
     "You are Dolores, a helpful and friendly personal assistant. "
@@ -41,6 +46,78 @@ def set_store(store: ConversationStore) -> None:
     _store = store
 
 
+def set_cache(cache: ResponseCache) -> None:
+    global _cache
+    _cache = cache
+
+
+def _sse(event: dict) -> bytes:
+    """Frame an event as a single SSE data message."""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
+def _trim_history(messages: list[dict]) -> list[dict]:
+    """Keep the last ``max_history_messages`` turns to bound prompt size."""
+    limit = settings.max_history_messages
+    if limit <= 0 or len(messages) <= limit:
+        return messages
+    messages = messages[-limit:]
+    # Tool results are only valid after the assistant turn that requested them
+    while messages and messages[0].get("role") == "tool":
+        messages.pop(0)
+    return messages
+
+
+def _compose_messages(history: list[dict], system_prompt: str, user_message: str) -> list[dict]:
+    """Build the LiteLLM message list in one allocation."""
+    user = {"role": "user", "content": user_message}
+    if history and history[0].get("role") == "system":
+        return [*history, user]
+    return [{"role": "system", "content": system_prompt}, *history, user]
+
+
+def _completion_kwargs(
+    req: ChatRequest, model_str: str, messages: list[dict], stream: bool = False
+) -> dict:
+    """Build litellm.acompletion arguments in a single dict literal."""
+    kwargs: dict = {
+        "model": model_str,
+        "messages": messages,
+        "max_tokens": req.max_tokens,
+        "temperature": req.temperature,
+    }
+    if stream:
+        kwargs["stream"] = True
+    if req.tools:
+        kwargs["tools"] = req.tools
+    return kwargs
+
+
+def _shared_completion(key: str, kwargs: dict) -> asyncio.Task:
+    """Return the in-flight completion for ``key``, starting one if needed."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(litellm.acompletion(**kwargs))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task
+
+
+def _log_write_failure(task: asyncio.Task) -> None:
+    """Done callback: log (and so retrieve) a failed background store write."""
+    if not task.cancelled() and (exc := task.exception()) is not None:
+        log.error("conversation_write_failed", error=str(exc))
+
+
+def _response_cache_key(req: ChatRequest, model_str: str, messages: list[dict]) -> str | None:
+    """Cache key for this request, or None when the response must not be cached."""
+    if _cache is None or not _cache.enabled:
+        return None
+    if req.tools or req.temperature > settings.cache_max_temperature:
+        return None
+    return cache_key(model_str, messages, req.temperature, req.max_tokens)
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     req: ChatRequest,
@@ -56,35 +133,51 @@ async def chat(
     # Get or create conversation
     conv_id = req.conversation_id
     if conv_id and await store.exists(conv_id):
-        messages = await store.get_history(conv_id)
+        history = _trim_history(await store.get_history(conv_id))
     else:
         conv_id = await store.create(conv_id)
-        messages = []
-
-    # Add system prompt if not already present
-    system_prompt = req.system_prompt or DEFAULT_SYSTEM_PROMPT
-    if not messages or messages[0].get("role") != "system":
-        messages.insert(0, {"role": "system", "content": system_prompt})
-
-    # Append user message
-    messages.append({"role": "user", "content": req.message})
-    await store.append(conv_id, "user", req.message)
+        history = []
+
+    # System prompt (if not already present) + history + user message
+    messages = _compose_messages(history, req.system_prompt or DEFAULT_SYSTEM_PROMPT, req.message)
+    # Persist the user turn while the model call is in flight
+    user_write = asyncio.ensure_future(store.append(conv_id, "user", req.message))
+
+    key = _response_cache_key(req, model_str, messages)
+    if key is not None:
+        cached = await _cache.get(key)
+        if cached is not None:
+            await user_write
+            await store.append(conv_id, "assistant", cached["message"])
+            elapsed_ms = int((time.monotonic() - start) * 1000)
+            log.info(
+                "chat_cache_hit",
+                provider=provider,
+                model=model_str,
+                conversation_id=conv_id,
+                processing_time_ms=elapsed_ms,
+            )
+            return ChatResponse(
+                conversation_id=conv_id,
+                message=cached["message"],
+                provider=provider,
+                model=model_str,
+                processing_time_ms=elapsed_ms,
+            )
 
     # Call LiteLLM
-    kwargs: dict = {
-        "model": model_str,
-        "messages": messages,
-        "max_tokens": req.max_tokens,
-        "temperature": req.temperature,
-    }
-    if req.tools:
-        kwargs["tools"] = req.tools
-
+    kwargs = _completion_kwargs(req, model_str, messages)
     try:
-        response = await litellm.acompletion(**kwargs)
+        if key is not None:
+            # Shielded so one caller disconnecting doesn't cancel the others' call
+            response = await asyncio.shield(_shared_completion(key, kwargs))
+        else:
+            response = await litellm.acompletion(**kwargs)
     except Exception as e:
+        await user_write
         log.error("llm_error", provider=provider, model=model_str, error=str(e))
         raise HTTPException(status_code=502, detail=f"LLM call failed: {e}")
+    await user_write
 
     choice = response.choices[0]
     assistant_msg = choice.message.content or ""
@@ -102,6 +195,8 @@ async def chat(
 
     # Store assistant response
     await store.append(conv_id, "assistant", assistant_msg, tool_calls=tool_calls or None)
+    if key is not None and not tool_calls:
+        await _cache.set(key, {"message": assistant_msg})
 
     elapsed_ms = int((time.monotonic() - start) * 1000)
     usage = None
@@ -145,58 +240,90 @@ async def chat_stream(
     # Get or create conversation
     conv_id = req.conversation_id
     if conv_id and await store.exists(conv_id):
-        messages = await store.get_history(conv_id)
+        history = _trim_history(await store.get_history(conv_id))
     else:
         conv_id = await store.create(conv_id)
-        messages = []
+        history = []
 
-    system_prompt = req.system_prompt or DEFAULT_SYSTEM_PROMPT
-    if not messages or messages[0].get("role") != "system":
-        messages.insert(0, {"role": "system", "content": system_prompt})
+    messages = _compose_messages(history, req.system_prompt or DEFAULT_SYSTEM_PROMPT, req.message)
+    user_write = asyncio.ensure_future(store.append(conv_id, "user", req.message))
+    # generate() may never run (client gone before streaming starts), so a
+    # failed write must not depend on it being awaited there
+    user_write.add_done_callback(_log_write_failure)
 
-    messages.append({"role": "user", "content": req.message})
-    await store.append(conv_id, "user", req.message)
-
-    kwargs: dict = {
-        "model": model_str,
-        "messages": messages,
-        "max_tokens": req.max_tokens,
-        "temperature": req.temperature,
-        "stream": True,
-    }
-    if req.tools:
-        kwargs["tools"] = req.tools
+    kwargs = _completion_kwargs(req, model_str, messages, stream=True)
+    key = _response_cache_key(req, model_str, messages)
 
     async def generate():
         full_text = ""
         try:
+            cached = await _cache.get(key) if key is not None else None
+            if cached is not None:
+                full_text = cached["message"]
+                await user_write
+                await store.append(conv_id, "assistant", full_text)
+                log.info("chat_cache_hit", provider=provider, model=model_str, conversation_id=conv_id)
+                yield _sse({"type": "token", "content": full_text, "conversation_id": conv_id})
+                yield _sse(
+                    {
+                        "type": "done",
+                        "content": full_text,
+                        "conversation_id": conv_id,
+                        "provider": provider,
+                        "model": model_str,
+                    }
+                )
+                return
+
+            # Coalesce deltas into size/time-bounded token frames
+            flush_bytes = settings.sse_flush_bytes
+            flush_seconds = settings.sse_flush_ms / 1000
+            buf: list[str] = []
+            buf_size = 0
+            last_flush = time.monotonic()
+
             response = await litellm.acompletion(**kwargs)
             async for chunk in response:
                 delta = chunk.choices[0].delta
                 if delta.content:
                     full_text += delta.content
-                    yield f"data: {json.dumps({'type': 'token', 'content': delta.content, 'conversation_id': conv_id})}\n\n"
+                    buf.append(delta.content)
+                    buf_size += len(delta.content)
+                    now = time.monotonic()
+                    if buf_size >= flush_bytes or now - last_flush >= flush_seconds:
+                        yield _sse({"type": "token", "content": "".join(buf), "conversation_id": conv_id})
+                        buf.clear()
+                        buf_size = 0
+                        last_flush = now
+
+            if buf:
+                yield _sse({"type": "token", "content": "".join(buf), "conversation_id": conv_id})
 
             # Store full response
+            await user_write
             await store.append(conv_id, "assistant", full_text)
-
-            yield f"data: {json.dumps({'type': 'done', 'content': full_text, 'conversation_id': conv_id, 'provider': provider, 'model': model_str})}\n\n"
+            if key is not None:
+                await _cache.set(key, {"message": full_text})
+
+            yield _sse(
+                {
+                    "type": "done",
+                    "content": full_text,
+                    "conversation_id": conv_id,
+                    "provider": provider,
+                    "model": model_str,
+                }
+            )
 
         except Exception as e:
             log.error("stream_error", provider=provider, model=model_str, error=str(e))
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield _sse({"type": "error", "error": str(e)})
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
 
 @router.get("/providers", response_model=list[ProviderInfo])
-async def list_providers(_auth: ServicePSK = None) -> list[ProviderInfo]:
+async def list_providers(_auth: ServicePSK = None) -> Response:
     """List available LLM providers and their models."""
-    return [
-        ProviderInfo(
-            name=info["name"],
-            models=info["models"],
-            default_model=info["default_model"],
-        )
-        for info in PROVIDERS.values()
-    ]
+    # Serialized once in setup_providers(); response_model is kept for the schema
+    return Response(providers_json(), media_type="application/json")
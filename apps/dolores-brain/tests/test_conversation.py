@@ -0,0 +1,27 @@
+import asyncio
+
+from dolores_brain.conversation import ConversationStore
+
+
+def test_history_copies_do_not_alias_cache(tmp_path):
+    async def run():
+        store = ConversationStore(str(tmp_path / "conv.db"))
+        await store.init()
+        try:
+            cid = await store.create()
+            await store.append(cid, "user", "hi")
+            await store.append(cid, "assistant", "", tool_calls=[{"id": "c1", "function": {"name": "f"}}])
+
+            history = await store.get_history(cid)
+            history[0]["content"] = "changed"
+            history[1]["tool_calls"][0]["id"] = "changed"
+            history.append({"role": "user", "content": "extra"})
+
+            assert await store.get_history(cid) == [
+                {"role": "user", "content": "hi"},
+                {"role": "assistant", "content": "", "tool_calls": [{"id": "c1", "function": {"name": "f"}}]},
+            ]
+        finally:
+            await store.close()
+
+    asyncio.run(run())
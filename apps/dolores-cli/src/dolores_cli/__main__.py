@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 
 
 def main() -> None:
@@ -18,6 +17,8 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "chat" or args.command is None:
+        import asyncio
+
         from .chat import chat_loop
 
         asyncio.run(
@@ -2,19 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
-import sys
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.patch_stdout import patch_stdout
-from rich.console import Console
-from rich.live import Live
-from rich.text import Text
-
-from .client import DoloresClient
-
-console = Console()
-
 
 async def chat_loop(
     server_url: str | None = None,
@@ -22,6 +9,14 @@ async def chat_loop(
     provider: str | None = None,
 ) -> None:
     """Run the interactive chat loop."""
+    # Imported here so the CLI's other code paths don't pay for rich/prompt_toolkit
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.patch_stdout import patch_stdout
+    from rich.console import Console
+
+    from .client import DoloresClient
+
+    console = Console()
     client = DoloresClient(server_url=server_url, api_key=api_key, provider=provider)
     session: PromptSession = PromptSession()
 
@@ -34,9 +29,7 @@ async def chat_loop(
         while True:
             with patch_stdout():
                 try:
-                    user_input = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: session.prompt("You: ")
-                    )
+                    user_input = await session.prompt_async("You: ")
                 except (EOFError, KeyboardInterrupt):
                     break
 
@@ -46,7 +39,6 @@ async def chat_loop(
                 break
 
             # Stream response
-            response_text = Text()
             console.print("[bold blue]Dolores:[/bold blue] ", end="")
 
             async for event in client.send_text(user_input):
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
+import orjson
 import websockets
 
 from .config import settings
 
+# Keepalive pings detect dead connections on long-lived sessions; compression is
+# off since frames are small JSON or already-compressed audio.
+_CONNECT_KWARGS = {
+    "ping_interval": 20,
+    "ping_timeout": 20,
+    "max_size": 2**23,
+    "compression": None,
+}
+
 
 class DoloresClient:
     """WebSocket client to the assistant orchestrator."""
@@ -35,7 +46,7 @@ class DoloresClient:
         if self._api_key:
             ws_url += f"?token={self._api_key}"
 
-        self._ws = await websockets.connect(ws_url)
+        self._ws = await websockets.connect(ws_url, **_CONNECT_KWARGS)
 
         # Send session.start
         session_msg = {
@@ -48,11 +59,11 @@ class DoloresClient:
         if conversation_id:
             session_msg["conversation_id"] = conversation_id
 
-        await self._ws.send(json.dumps(session_msg))
+        await self._ws.send(orjson.dumps(session_msg).decode())
 
         # Wait for session.created
         raw = await self._ws.recv()
-        resp = json.loads(raw)
+        resp = orjson.loads(raw)
         if resp.get("type") == "session.created":
             self._conversation_id = resp.get("conversation_id")
 
@@ -61,15 +72,18 @@ class DoloresClient:
         if not self._ws:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        await self._ws.send(json.dumps({"type": "text.send", "text": text}))
+        await self._ws.send(orjson.dumps({"type": "text.send", "text": text}).decode())
 
         while True:
-            raw = await self._ws.recv()
-            if isinstance(raw, bytes):
+            # decode=False skips the UTF-8 decode of text frames; orjson parses bytes
+            raw = await self._ws.recv(decode=False)
+            if raw[:1] != b"{":
                 # Audio data — skip in text mode
                 continue
-
-            event = json.loads(raw)
+            try:
+                event = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                continue
             yield event
 
             if event.get("type") in ("response.end", "error"):
@@ -79,8 +93,61 @@ class DoloresClient:
         """End the session and close the connection."""
         if self._ws:
             try:
-                await self._ws.send(json.dumps({"type": "session.end"}))
+                await self._ws.send(orjson.dumps({"type": "session.end"}).decode())
             except Exception:
                 pass
             await self._ws.close()
             self._ws = None
+
+
+class DoloresClientPool:
+    """Pool of connected clients so scripts can reuse sessions across requests.
+
+    Each pooled client keeps its own conversation, so reuse it only for
+    independent or continuing exchanges.
+    """
+
+    def __init__(self, size: int = 4, **client_kwargs) -> None:
+        self._size = size
+        self._client_kwargs = client_kwargs
+        self._idle: asyncio.Queue[DoloresClient] = asyncio.Queue()
+        self._created = 0
+
+    async def acquire(self) -> DoloresClient:
+        """Return an idle client, connecting a new one while under ``size``."""
+        if self._idle.empty() and self._created < self._size:
+            self._created += 1
+            client = DoloresClient(**self._client_kwargs)
+            try:
+                await client.connect()
+            except Exception:
+                self._created -= 1
+                raise
+            return client
+        return await self._idle.get()
+
+    async def release(self, client: DoloresClient, discard: bool = False) -> None:
+        """Return a client to the pool, or close it if ``discard`` is set."""
+        if discard:
+            self._created -= 1
+            await client.close()
+            return
+        self._idle.put_nowait(client)
+
+    @asynccontextmanager
+    async def client(self) -> AsyncIterator[DoloresClient]:
+        """Borrow a client; it is discarded if the block raises."""
+        client = await self.acquire()
+        try:
+            yield client
+        except BaseException:
+            await self.release(client, discard=True)
+            raise
+        await self.release(client)
+
+    async def close(self) -> None:
+        """Close all idle clients."""
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            self._created -= 1
+            await client.close()
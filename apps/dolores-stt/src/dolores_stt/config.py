@@ -12,6 +12,8 @@ class STTConfig:
     device: str = get_env("STT_DEVICE", "auto")
     compute_type: str = get_env("STT_COMPUTE_TYPE", "int8")
     cpu_threads: int = get_env_int("STT_CPU_THREADS", 4)
+    # Concurrent inference calls; the model runs one at a time per worker
+    max_concurrency: int = get_env_int("STT_MAX_CONCURRENCY", 1)
     max_upload_bytes: int = get_env_int("STT_MAX_UPLOAD_MB", 25) * 1024 * 1024
     beam_size: int = get_env_int("STT_BEAM_SIZE", 5)
     language: str = get_env("STT_LANGUAGE", "")  # empty = auto-detect
@@ -3,15 +3,13 @@
 from __future__ import annotations
 
 import io
-import tempfile
 import time
-from pathlib import Path
 
 from dolores_common.logging import get_logger
 
 log = get_logger(__name__)
 
-# Supported audio MIME types and their file extensions
+# Supported audio MIME types (used for upload validation; decoding sniffs the container)
 SUPPORTED_FORMATS = {
     "audio/wav": ".wav",
     "audio/x-wav": ".wav",
@@ -26,6 +24,52 @@ SUPPORTED_FORMATS = {
 }
 
 
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a bytes-like buffer, without copying it.
+
+    ``io.BytesIO`` copies anything that isn't ``bytes``; this lets the WS
+    route hand its ``bytearray`` accumulator straight to the decoder.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        # Seeking past the end is allowed, as with BytesIO; reads there return nothing
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def close(self) -> None:
+        """Release the view so the underlying bytearray can be resized again."""
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _audio_file(audio_data: bytes | bytearray | memoryview) -> io.RawIOBase | io.BytesIO:
+    # BytesIO shares an immutable bytes object; wrap mutable buffers instead
+    if isinstance(audio_data, bytes):
+        return io.BytesIO(audio_data)
+    return _BufferReader(audio_data)
+
+
 class STTEngine:
     """Wraps faster-whisper for transcription."""
 
@@ -72,7 +116,7 @@ class STTEngine:
 
     def transcribe(
         self,
-        audio_data: bytes,
+        audio_data: bytes | bytearray | memoryview,
         content_type: str = "audio/wav",
         language: str | None = None,
     ) -> dict:
@@ -86,37 +130,29 @@ class STTEngine:
 
         start = time.monotonic()
 
-        # Write audio to a temp file (faster-whisper needs a file path or file-like)
-        ext = SUPPORTED_FORMATS.get(content_type, ".wav")
-        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            tmp.write(audio_data)
-            tmp_path = Path(tmp.name)
+        kwargs: dict = {"beam_size": self._beam_size}
+        if language:
+            kwargs["language"] = language
 
-        try:
-            kwargs: dict = {"beam_size": self._beam_size}
-            if language:
-                kwargs["language"] = language
-
-            segments_iter, info = self._model.transcribe(str(tmp_path), **kwargs)
+        # faster-whisper decodes file-like objects with PyAV, so no temp file is needed
+        with _audio_file(audio_data) as audio_file:
+            segments_iter, info = self._model.transcribe(audio_file, **kwargs)
 
             segments = []
-            full_text_parts = []
             for seg in segments_iter:
+                text = seg.text.strip()
                 segments.append(
                     {
                         "start": round(seg.start, 3),
                         "end": round(seg.end, 3),
-                        "text": seg.text.strip(),
+                        "text": text,
                         "avg_logprob": round(seg.avg_logprob, 4) if seg.avg_logprob else None,
                         "no_speech_prob": round(seg.no_speech_prob, 4) if seg.no_speech_prob else None,
                     }
                 )
-                full_text_parts.append(seg.text.strip())
-        finally:
-            tmp_path.unlink(missing_ok=True)
 
         elapsed_ms = int((time.monotonic() - start) * 1000)
-        full_text = " ".join(full_text_parts)
+        full_text = " ".join(seg["text"] for seg in segments)
 
         log.info(
             "transcription_complete",
@@ -137,7 +173,7 @@ class STTEngine:
 
     def transcribe_stream(
         self,
-        audio_data: bytes,
+        audio_data: bytes | bytearray | memoryview,
         content_type: str = "audio/wav",
         language: str | None = None,
     ):
@@ -148,17 +184,12 @@ class STTEngine:
         if not self._model:
             raise RuntimeError("Model not loaded. Call load() first.")
 
-        ext = SUPPORTED_FORMATS.get(content_type, ".wav")
-        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            tmp.write(audio_data)
-            tmp_path = Path(tmp.name)
-
-        try:
-            kwargs: dict = {"beam_size": self._beam_size}
-            if language:
-                kwargs["language"] = language
+        kwargs: dict = {"beam_size": self._beam_size}
+        if language:
+            kwargs["language"] = language
 
-            segments_iter, info = self._model.transcribe(str(tmp_path), **kwargs)
+        with _audio_file(audio_data) as audio_file:
+            segments_iter, info = self._model.transcribe(audio_file, **kwargs)
 
             full_text_parts = []
             for seg in segments_iter:
@@ -166,10 +197,8 @@ class STTEngine:
                 full_text_parts.append(text)
                 yield {"type": "partial", "text": text, "language": info.language}
 
-            yield {
-                "type": "final",
-                "text": " ".join(full_text_parts),
-                "language": info.language,
-            }
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        yield {
+            "type": "final",
+            "text": " ".join(full_text_parts),
+            "language": info.language,
+        }
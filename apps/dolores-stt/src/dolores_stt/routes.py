@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-import io
+import asyncio
+import functools
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
 
 from dolores_common.auth import ServicePSK
@@ -11,7 +15,7 @@ from dolores_common.logging import get_logger
 
 from .config import settings
 from .engine import SUPPORTED_FORMATS, STTEngine
-from .schemas import StreamMessage, TranscribeResponse
+from .schemas import TranscribeResponse
 
 log = get_logger(__name__)
 
@@ -20,6 +24,10 @@ router = APIRouter(prefix="/v1", tags=["stt"])
 # Singleton engine — initialized at app startup via lifespan
 _engine: STTEngine | None = None
 
+# Bounds inference threads so CTranslate2 isn't oversubscribed
+_inference_semaphore = asyncio.Semaphore(settings.max_concurrency)
+_DONE = object()
+
 
 def get_engine() -> STTEngine:
     if _engine is None or not _engine.is_loaded:
@@ -32,6 +40,56 @@ def set_engine(engine: STTEngine) -> None:
     _engine = engine
 
 
+async def _start_inference(fn: Callable[[], object]) -> asyncio.Future:
+    """Start ``fn`` in a worker thread once an inference slot is free.
+
+    The thread cannot be interrupted, so the slot is released when the
+    thread finishes rather than when the caller stops waiting for it.
+    """
+    await _inference_semaphore.acquire()
+    try:
+        future = asyncio.ensure_future(asyncio.to_thread(fn))
+    except BaseException:
+        _inference_semaphore.release()
+        raise
+    future.add_done_callback(_release_inference_slot)
+    return future
+
+
+def _release_inference_slot(future: asyncio.Future) -> None:
+    _inference_semaphore.release()
+    if not future.cancelled():
+        future.exception()  # a caller that went away can't retrieve it
+
+
+async def _iterate_in_thread(gen_fn: Callable[[], Iterator[dict]]) -> AsyncIterator[dict]:
+    """Run a blocking generator in a worker thread, yielding its items as they arrive."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def _worker() -> None:
+        try:
+            for item in gen_fn():
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    await _start_inference(_worker)
+    try:
+        while (item := await queue.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # The thread stops at its next item and then frees its slot
+        stop.set()
+
+
 @router.post("/transcribe", response_model=TranscribeResponse)
 async def transcribe(
     file: UploadFile,
@@ -59,7 +117,10 @@ async def transcribe(
 
     log.info("transcribe_request", content_type=content_type, size_bytes=len(audio_data))
 
-    result = engine.transcribe(audio_data, content_type=content_type, language=language)
+    inference = await _start_inference(
+        functools.partial(engine.transcribe, audio_data, content_type=content_type, language=language)
+    )
+    result = await asyncio.shield(inference)
     return TranscribeResponse(**result)
 
 
@@ -80,21 +141,19 @@ async def stream_transcription(websocket: WebSocket) -> None:
         await websocket.close(code=1011)
         return
 
-    audio_buffer = io.BytesIO()
+    audio_buffer = bytearray()
 
     try:
         while True:
             message = await websocket.receive()
 
             if "bytes" in message:
-                audio_buffer.write(message["bytes"])
+                audio_buffer.extend(message["bytes"])
 
             elif "text" in message:
-                import json
-
                 try:
-                    data = json.loads(message["text"])
-                except json.JSONDecodeError:
+                    data = orjson.loads(message["text"])
+                except orjson.JSONDecodeError:
                     await websocket.send_json(
                         {"type": "error", "text": "", "error": "Invalid JSON"}
                     )
@@ -102,29 +161,31 @@ async def stream_transcription(websocket: WebSocket) -> None:
 
                 if data.get("type") == "audio.end":
                     # Process accumulated audio
-                    audio_data = audio_buffer.getvalue()
-                    if not audio_data:
+                    if not audio_buffer:
                         await websocket.send_json(
                             {"type": "error", "text": "", "error": "No audio data received"}
                         )
-                        audio_buffer = io.BytesIO()
                         continue
 
                     language = data.get("language")
 
-                    for chunk in engine.transcribe_stream(
-                        audio_data, content_type="audio/webm", language=language
+                    async for chunk in _iterate_in_thread(
+                        lambda: engine.transcribe_stream(
+                            audio_buffer, content_type="audio/webm", language=language
+                        )
                     ):
+                        # Engine output is trusted; same shape as schemas.StreamMessage
                         await websocket.send_json(
-                            StreamMessage(
-                                type=chunk["type"],
-                                text=chunk["text"],
-                                language=chunk.get("language", ""),
-                            ).model_dump()
+                            {
+                                "type": chunk["type"],
+                                "text": chunk["text"],
+                                "language": chunk.get("language", ""),
+                                "error": "",
+                            }
                         )
 
-                    # Reset buffer for next utterance
-                    audio_buffer = io.BytesIO()
+                    # Reset buffer for next utterance (reuses the allocation)
+                    audio_buffer.clear()
 
     except WebSocketDisconnect:
         log.info("ws_disconnected")
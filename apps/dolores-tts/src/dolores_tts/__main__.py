@@ -1,24 +1,48 @@
 """Entry point for dolores-tts service.
 
 CRITICAL: Must run with single worker due to CUDA/torch multiprocessing issues.
+Runs on uvloop + httptools (from uvicorn[standard]) where available.
 """
 
+import multiprocessing
+
+import uvicorn
+
+from .config import settings
+
 try:
-    import torch.multiprocessing
-    torch.multiprocessing.set_start_method("spawn", force=True)
+    import uvloop  # noqa: F401
+    _LOOP = "uvloop"
 except ImportError:
-    pass  # torch not installed, running without GPU support
+    _LOOP = "asyncio"
 
-import uvicorn
+
+def _configure_mp() -> None:
+    """Pick a CUDA-safe start method for any child processes.
+
+    Only the XTTS engine needs torch; Piper starts without importing it.
+    """
+    if settings.engine == "coqui_xtts":
+        try:
+            import torch.multiprocessing
+            torch.multiprocessing.set_start_method("spawn", force=True)
+        except ImportError:
+            pass  # torch not installed, running without GPU support
+    elif "forkserver" in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method("forkserver", force=True)
 
 
 def main() -> None:
+    _configure_mp()
     uvicorn.run(
         "dolores_tts.main:app",
         host="0.0.0.0",
         port=8002,
         reload=False,
         workers=1,  # MUST be 1 - CUDA/uvicorn forking issue
+        loop=_LOOP,
+        http="httptools",
+        log_level=settings.log_level.lower(),
     )
 
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dolores_common.config import get_env, get_env_int
+from dolores_common.config import get_env, get_env_bool, get_env_int
 
 
 class TTSConfig:
@@ -10,11 +10,18 @@ class TTSConfig:
 
     engine: str = get_env("TTS_ENGINE", "coqui_xtts")  # coqui_xtts or piper
     device: str = get_env("TTS_DEVICE", "auto")
+    precision: str = get_env("TTS_PRECISION", "fp16")  # fp32, fp16 or bf16 (CUDA only)
+    compile_decoder: bool = get_env_bool("TTS_COMPILE", False)  # torch.compile the GPT decoder (CUDA only)
     voices_dir: str = get_env("TTS_VOICES_DIR", "data/voices")
     db_path: str = get_env("TTS_DB_PATH", "data/tts.db")
     sample_rate: int = get_env_int("TTS_SAMPLE_RATE", 24000)
     max_text_length: int = get_env_int("TTS_MAX_TEXT_LENGTH", 5000)
 
+    # Request scheduler: max requests drained per batch, and how long to hold
+    # a batch open for more requests (0 = only take what is already queued)
+    batch_max_size: int = get_env_int("TTS_BATCH_MAX_SIZE", 8)
+    batch_max_delay_ms: int = get_env_int("TTS_BATCH_MAX_DELAY_MS", 0)
+
     # Logging
     log_level: str = get_env("LOG_LEVEL", "INFO")
     log_format: str = get_env("LOG_FORMAT", "console")
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 
 class TTSEngine(ABC):
@@ -31,6 +33,43 @@ class TTSEngine(ABC):
         """Synthesize text to WAV audio bytes (16-bit PCM)."""
         ...
 
+    async def start(self) -> None:
+        """Start background workers (e.g. a request scheduler). Call after load()."""
+
+    async def stop(self) -> None:
+        """Stop background workers started by start()."""
+
+    async def submit(
+        self,
+        text: str,
+        voice_id: str = "default",
+        sample_rate: int = 24000,
+    ) -> bytes:
+        """Synthesize from async code without blocking the event loop.
+
+        Backends may override this to queue or batch requests.
+        """
+        return await asyncio.to_thread(self.synthesize, text, voice_id, sample_rate)
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: str = "default",
+        sample_rate: int = 24000,
+    ) -> AsyncIterator[bytes]:
+        """Yield WAV bytes progressively.
+
+        The default yields the whole file at once; streaming backends yield
+        a header followed by PCM chunks as they are produced.
+        """
+        yield await self.submit(text, voice_id, sample_rate)
+
+    async def prepare_voice(self, voice_id: str) -> None:
+        """Precompute per-voice state after a profile is created."""
+
+    def forget_voice(self, voice_id: str) -> None:
+        """Drop any cached state for a deleted voice profile."""
+
     @abstractmethod
     def list_voices(self) -> list[str]:
         """Return available voice IDs."""
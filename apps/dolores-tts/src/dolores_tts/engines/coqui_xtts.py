@@ -5,9 +5,14 @@ IMPORTANT: Must run with a single uvicorn worker due to CUDA/torch forking issue
 
 from __future__ import annotations
 
-import io
+import asyncio
+import contextlib
+import functools
 import struct
+import threading
 import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 
 from dolores_common.logging import get_logger
@@ -17,32 +22,287 @@ from ..engine import TTSEngine
 log = get_logger(__name__)
 
 
-def _write_wav_header(f: io.BytesIO, num_samples: int, sample_rate: int, num_channels: int = 1, bits_per_sample: int = 16) -> None:
-    """Write a WAV file header."""
-    data_size = num_samples * num_channels * (bits_per_sample // 8)
-    f.write(b"RIFF")
-    f.write(struct.pack("<I", 36 + data_size))
-    f.write(b"WAVE")
-    f.write(b"fmt ")
-    f.write(struct.pack("<I", 16))  # chunk size
-    f.write(struct.pack("<H", 1))   # PCM format
-    f.write(struct.pack("<H", num_channels))
-    f.write(struct.pack("<I", sample_rate))
-    f.write(struct.pack("<I", sample_rate * num_channels * (bits_per_sample // 8)))
-    f.write(struct.pack("<H", num_channels * (bits_per_sample // 8)))
-    f.write(struct.pack("<H", bits_per_sample))
-    f.write(b"data")
-    f.write(struct.pack("<I", data_size))
+# RIFF/WAVE header with a single PCM "fmt " chunk followed by the "data" chunk
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+_WAV_HEADER_SIZE = _WAV_HEADER.size  # 44
+
+
+def _pack_wav_header(
+    buf: bytearray,
+    num_samples: int,
+    sample_rate: int,
+    num_channels: int = 1,
+    bits_per_sample: int = 16,
+) -> None:
+    """Write a WAV header into the first 44 bytes of ``buf``."""
+    block_align = num_channels * (bits_per_sample // 8)
+    data_size = num_samples * block_align
+    _WAV_HEADER.pack_into(
+        buf,
+        0,
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # chunk size
+        1,  # PCM format
+        num_channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits_per_sample,
+        b"data",
+        data_size,
+    )
+
+
+def _streaming_wav_header(sample_rate: int) -> bytes:
+    """WAV header for a stream of unknown length (RIFF/data sizes set to max)."""
+    buf = bytearray(_WAV_HEADER_SIZE)
+    _pack_wav_header(buf, 0, sample_rate)
+    struct.pack_into("<I", buf, 4, 0xFFFFFFFF)
+    struct.pack_into("<I", buf, _WAV_HEADER_SIZE - 4, 0xFFFFFFFF)
+    return bytes(buf)
+
+
+def _clipped_float32(samples):
+    """Model output (list, ndarray or tensor) as a flat float32 array clipped to [-1, 1].
+
+    Array inputs are clipped in place.
+    """
+    import numpy as np
+
+    if hasattr(samples, "cpu"):  # torch.Tensor
+        samples = samples.detach().cpu().numpy()
+    wav = np.asarray(samples, dtype=np.float32).reshape(-1)
+    np.clip(wav, -1.0, 1.0, out=wav)
+    return wav
+
+
+def _encode_pcm16(samples) -> bytes:
+    """Encode float samples in [-1, 1] as raw 16-bit PCM.
+
+    Tensors are clipped, scaled and cast on their own device, so a CUDA
+    tensor crosses to the host as int16 (half the bytes of float32).
+    """
+    import numpy as np
+
+    if hasattr(samples, "clamp"):  # torch.Tensor
+        import torch
+
+        # Out of place: XTTS keeps the decoder output around for cross-fading
+        pcm = samples.detach().reshape(-1).float().clamp(-1.0, 1.0).mul_(32767).to(torch.int16)
+        return pcm.cpu().numpy().tobytes()
+
+    wav = _clipped_float32(samples)
+    pcm = np.empty(wav.size, dtype=np.int16)
+    np.multiply(wav, 32767, out=pcm, casting="unsafe")
+    return pcm.tobytes()
+
+
+def _encode_wav(samples, sample_rate: int) -> bytes:
+    """Encode float samples in [-1, 1] as a 16-bit PCM mono WAV file.
+
+    The scaled samples are cast straight into the output buffer, so the PCM
+    data is written only once.
+    """
+    import numpy as np
+
+    wav = _clipped_float32(samples)
+    out = bytearray(_WAV_HEADER_SIZE + wav.size * 2)
+    _pack_wav_header(out, wav.size, sample_rate)
+    pcm = np.frombuffer(out, dtype=np.int16, offset=_WAV_HEADER_SIZE)
+    np.multiply(wav, 32767, out=pcm, casting="unsafe")
+    return bytes(out)
+
+
+_NATIVE_SAMPLE_RATE = 24000  # XTTS v2 output rate
+
+
+@functools.lru_cache(maxsize=8)
+def _resampler(sample_rate: int):
+    """Polyphase resampler from the native rate; the filter kernel is built once per rate."""
+    import torchaudio
+
+    return torchaudio.transforms.Resample(_NATIVE_SAMPLE_RATE, sample_rate)
+
+
+def _resample(samples, sample_rate: int):
+    """Native-rate model output at ``sample_rate``, passed through untouched at the native rate."""
+    if sample_rate == _NATIVE_SAMPLE_RATE:
+        return samples
+    import numpy as np
+    import torch
+
+    if isinstance(samples, torch.Tensor):
+        wav = samples.detach().reshape(-1).float().cpu()
+    else:
+        wav = torch.from_numpy(np.asarray(samples, dtype=np.float32).reshape(-1))
+    with torch.inference_mode():
+        return _resampler(sample_rate)(wav).numpy()
+
+
+def _encode_output(samples, sample_rate: int) -> bytes:
+    """Encode native-rate model output as a WAV file at ``sample_rate``."""
+    return _encode_wav(_resample(samples, sample_rate), sample_rate)
+
+
+_RequestKey = tuple[str, str, int]  # (text, voice_id, sample_rate)
+
+
+class _BatchScheduler:
+    """Queues synthesis requests and runs them one model call at a time.
+
+    XTTS synthesizes a single text per call, so a batch can't be fused into
+    one forward pass. Instead each batch collects up to ``max_batch_size``
+    queued requests (waiting at most ``max_batch_delay_ms`` for more), and
+    identical requests in it share a single model call.
+
+    Decoding runs on ``gpu_executor`` and WAV encoding on ``cpu_executor``;
+    the next model call starts as soon as the previous decode finishes,
+    without waiting for its encode.
+    """
+
+    def __init__(
+        self,
+        decode: Callable[[str, str], object],
+        encode: Callable[[object, int], bytes],
+        gpu_executor: Executor,
+        cpu_executor: Executor,
+        max_batch_size: int = 8,
+        max_batch_delay_ms: int = 0,
+    ) -> None:
+        self._decode = decode
+        self._encode = encode
+        self._gpu_executor = gpu_executor
+        self._cpu_executor = cpu_executor
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay_ms / 1000
+        self._queue: asyncio.Queue[tuple[_RequestKey, asyncio.Future]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, text: str, voice_id: str, sample_rate: int) -> bytes:
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(((text, voice_id, sample_rate), fut))
+        return await fut
+
+    async def _next_batch(self) -> list[tuple[_RequestKey, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_batch_delay
+        while len(batch) < self._max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            groups: dict[_RequestKey, list[asyncio.Future]] = {}
+            for key, fut in await self._next_batch():
+                groups.setdefault(key, []).append(fut)
+
+            for (text, voice_id, sample_rate), futs in groups.items():
+                futs = [f for f in futs if not f.done()]
+                if not futs:
+                    continue  # every caller went away
+                try:
+                    samples = await loop.run_in_executor(
+                        self._gpu_executor, self._decode, text, voice_id
+                    )
+                except Exception as e:
+                    _resolve(futs, exception=e)
+                    continue
+                encoded = loop.run_in_executor(
+                    self._cpu_executor, self._encode, samples, sample_rate
+                )
+                encoded.add_done_callback(functools.partial(_resolve_from, futs))
+
+
+def _resolve(futs: list[asyncio.Future], result=None, exception: BaseException | None = None) -> None:
+    for f in futs:
+        if f.done():
+            continue
+        if exception is not None:
+            f.set_exception(exception)
+        else:
+            f.set_result(result)
+
+
+def _resolve_from(futs: list[asyncio.Future], source: asyncio.Future) -> None:
+    if source.cancelled():
+        _resolve(futs, exception=asyncio.CancelledError())
+    elif source.exception() is not None:
+        _resolve(futs, exception=source.exception())
+    else:
+        _resolve(futs, result=source.result())
+
+
+def _consume_exception(fut: asyncio.Future) -> None:
+    """Mark a future's exception as retrieved; nobody is left to await it."""
+    if not fut.cancelled():
+        fut.exception()
 
 
 class CoquiXTTSEngine(TTSEngine):
     """Coqui XTTS v2 TTS engine with voice cloning support."""
 
-    def __init__(self, device: str = "auto", voices_dir: str = "data/voices") -> None:
+    def __init__(
+        self,
+        device: str = "auto",
+        voices_dir: str = "data/voices",
+        batch_max_size: int = 8,
+        batch_max_delay_ms: int = 0,
+        precision: str = "fp16",
+        compile_decoder: bool = False,
+    ) -> None:
         self._device = device
+        self._precision = precision
+        self._compile_decoder = compile_decoder
+        self._autocast_dtype = None
         self._voices_dir = Path(voices_dir)
         self._model = None
         self._config = None
+        self._xtts = None
+        # voice_id -> (gpt_cond_latent, speaker_embedding)
+        self._latents: dict[str, tuple] = {}
+        # All model work runs on this one thread so the event loop never blocks
+        # on inference. Jobs run one at a time, and that is the only
+        # serialization: anything that needs the model for several steps (a
+        # stream) must be a single job
+        self._gpu_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xtts")
+        # WAV encoding is CPU-only; keeping it off the xtts thread lets the
+        # next request start decoding immediately
+        self._cpu_exec = ThreadPoolExecutor(max_workers=2, thread_name_prefix="xtts-encode")
+        self._scheduler = _BatchScheduler(
+            self._decode,
+            _encode_output,
+            self._gpu_exec,
+            self._cpu_exec,
+            batch_max_size,
+            batch_max_delay_ms,
+        )
 
     @property
     def name(self) -> str:
@@ -68,14 +328,69 @@ class CoquiXTTSEngine(TTSEngine):
                 device = "cpu"
 
         self._model = TTS("tts_models/multilingual/multi-dataset/xtts_v2").to(device)
+        self._xtts = self._model.synthesizer.tts_model
+        self._xtts.eval()
+        if device == "cuda" and self._precision in ("fp16", "bf16"):
+            import torch
+
+            # Autocast rather than .half(): weights stay fp32, so numerically
+            # sensitive ops (norms, mel/speaker features) keep full precision
+            self._autocast_dtype = torch.float16 if self._precision == "fp16" else torch.bfloat16
+        if device == "cuda" and self._compile_decoder:
+            self._compile_gpt_decoder()
         self._voices_dir.mkdir(parents=True, exist_ok=True)
 
         # Pick the first available built-in speaker for default voice
         speakers = getattr(self._model, "speakers", None) or []
         self._default_speaker = speakers[0] if speakers else "Ana Florence"
 
+        if device == "cuda":
+            import torch
+
+            # Input shapes are stable enough for cuDNN autotuning to pay off
+            torch.backends.cudnn.benchmark = True
+        self._warmup()
+
         elapsed = round(time.monotonic() - start, 2)
-        log.info("tts_model_loaded", engine="coqui_xtts", device=device, elapsed_seconds=elapsed, default_speaker=self._default_speaker)
+        log.info(
+            "tts_model_loaded",
+            engine="coqui_xtts",
+            device=device,
+            precision=self._precision if self._autocast_dtype else "fp32",
+            elapsed_seconds=elapsed,
+            default_speaker=self._default_speaker,
+        )
+
+    def _warmup(self) -> None:
+        """Run one throwaway synthesis so the first real request is not cold.
+
+        Goes through ``synthesize`` so it primes exactly what requests use:
+        CUDA context, autotuned kernels, the compiled decoder (if enabled)
+        and the default speaker's cached latents.
+        """
+        start = time.monotonic()
+        try:
+            self.synthesize("Warm up.", "default")
+        except Exception as e:
+            log.warning("tts_warmup_failed", error=str(e))
+            return
+        log.info("tts_warmup_complete", elapsed_seconds=round(time.monotonic() - start, 2))
+
+    def _compile_gpt_decoder(self) -> None:
+        """torch.compile the per-token GPT decoder step.
+
+        HF ``generate()`` calls ``forward`` on the module itself, so the bound
+        method is replaced; wrapping the module would be bypassed. Shapes grow
+        by one token per step, hence ``dynamic=True``.
+        """
+        import torch
+
+        decoder = getattr(self._xtts.gpt, "gpt_inference", None)
+        if decoder is None:
+            log.warning("tts_compile_skipped", reason="gpt_inference not initialized")
+            return
+        decoder.forward = torch.compile(decoder.forward, dynamic=True, fullgraph=False)
+        log.info("tts_decoder_compiled")
 
     def synthesize(
         self,
@@ -84,35 +399,166 @@ class CoquiXTTSEngine(TTSEngine):
         sample_rate: int = 24000,
     ) -> bytes:
         """Synthesize text to WAV bytes using XTTS v2."""
+        return _encode_output(self._decode(text, voice_id), sample_rate)
+
+    def _decode(self, text: str, voice_id: str = "default"):
+        """Run the model and return the raw float samples."""
         if not self._model:
             raise RuntimeError("Model not loaded. Call load() first.")
 
-        # Resolve voice reference audio
-        speaker_wav = self._resolve_voice(voice_id)
+        start = time.perf_counter_ns()
+        gpt_cond_latent, speaker_embedding = self._voice_latents(voice_id)
 
-        start = time.monotonic()
-        tts_kwargs: dict = {"text": text, "language": "en"}
-        if speaker_wav:
-            tts_kwargs["speaker_wav"] = speaker_wav
-        else:
-            tts_kwargs["speaker"] = self._default_speaker
+        # Call Xtts directly: the TTS.tts() wrapper re-encodes speaker_wav every time
+        with self._inference():
+            out = self._xtts.inference(
+                text,
+                "en",
+                gpt_cond_latent,
+                speaker_embedding,
+                enable_text_splitting=True,
+            )
+
+        elapsed_ms = (time.perf_counter_ns() - start) // 1_000_000
+        log.info("synthesis_complete", voice_id=voice_id, text_length=len(text), elapsed_ms=elapsed_ms)
+
+        return out["wav"]
 
-        wav_list = self._model.tts(**tts_kwargs)
+    async def stream(
+        self,
+        text: str,
+        voice_id: str = "default",
+        sample_rate: int = 24000,
+    ) -> AsyncIterator[bytes]:
+        """Yield a streaming WAV header, then PCM chunks as XTTS decodes them.
 
-        # Convert float list to 16-bit PCM WAV bytes
-        import numpy as np
-        wav_array = np.array(wav_list, dtype=np.float32)
-        wav_array = np.clip(wav_array, -1.0, 1.0)
-        pcm_data = (wav_array * 32767).astype(np.int16).tobytes()
+        Only the native sample rate is streamed: resampling chunk by chunk
+        would leave discontinuities at every chunk boundary.
+        """
+        if not self._model:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        if sample_rate != _NATIVE_SAMPLE_RATE:
+            raise ValueError(f"Streaming is only supported at {_NATIVE_SAMPLE_RATE} Hz")
 
-        buf = io.BytesIO()
-        _write_wav_header(buf, len(wav_array), sample_rate)
-        buf.write(pcm_data)
+        yield _streaming_wav_header(sample_rate)
 
-        elapsed = round(time.monotonic() - start, 2)
-        log.info("synthesis_complete", voice_id=voice_id, text_length=len(text), elapsed_seconds=elapsed)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def generate() -> None:
+            # XTTS keeps the GPT prefix in model state between steps, so the
+            # whole generation is a single job on the model thread: nothing
+            # else can run on the model until it finishes
+            chunks = self._stream_pcm(text, voice_id)
+            try:
+                for chunk in chunks:
+                    if cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            finally:
+                chunks.close()
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        job = loop.run_in_executor(self._gpu_exec, generate)
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield chunk
+            await job  # re-raises a failed generation
+        finally:
+            # A client that went away stops the generation at its next chunk
+            cancelled.set()
+            job.add_done_callback(_consume_exception)
+
+    def _stream_pcm(self, text: str, voice_id: str) -> Iterator[bytes]:
+        start = time.monotonic()
+        gpt_cond_latent, speaker_embedding = self._voice_latents(voice_id)
+        wav_chunks = self._xtts.inference_stream(
+            text,
+            "en",
+            gpt_cond_latent,
+            speaker_embedding,
+            stream_chunk_size=20,
+            enable_text_splitting=True,
+        )
+        first_chunk_at = None
+        while True:
+            # Grad/autocast state is per thread, so enter it around each step
+            with self._inference():
+                wav_chunk = next(wav_chunks, None)
+            if wav_chunk is None:
+                break
+            if first_chunk_at is None:
+                first_chunk_at = time.monotonic()
+            yield _encode_pcm16(wav_chunk)
+
+        log.info(
+            "synthesis_stream_complete",
+            voice_id=voice_id,
+            text_length=len(text),
+            first_chunk_seconds=round(first_chunk_at - start, 2) if first_chunk_at else None,
+            elapsed_seconds=round(time.monotonic() - start, 2),
+        )
+
+    def _voice_latents(self, voice_id: str) -> tuple:
+        """Return cached (gpt_cond_latent, speaker_embedding) for a voice."""
+        latents = self._latents.get(voice_id)
+        if latents is not None:
+            return latents
 
-        return buf.getvalue()
+        speaker_wav = self._resolve_voice(voice_id)
+        if speaker_wav:
+            with self._inference():
+                latents = self._xtts.get_conditioning_latents(audio_path=[speaker_wav])
+            log.info("voice_latents_cached", voice_id=voice_id)
+        else:
+            # Unknown voices fall back to the built-in speaker; cache that under
+            # "default" so a profile created later for voice_id is still picked up
+            voice_id = "default"
+            latents = self._latents.get(voice_id)
+            if latents is None:
+                speaker = self._xtts.speaker_manager.speakers[self._default_speaker]
+                latents = (speaker["gpt_cond_latent"], speaker["speaker_embedding"])
+        self._latents[voice_id] = latents
+        return latents
+
+    async def prepare_voice(self, voice_id: str) -> None:
+        """Encode a new profile's reference audio now, off the request path."""
+        self._latents.pop(voice_id, None)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._gpu_exec, self._voice_latents, voice_id)
+
+    def forget_voice(self, voice_id: str) -> None:
+        self._latents.pop(voice_id, None)
+
+    @contextlib.contextmanager
+    def _inference(self) -> Iterator[None]:
+        """No-autograd context for model calls, with mixed precision on CUDA."""
+        import torch
+
+        with torch.inference_mode():
+            if self._autocast_dtype is None:
+                yield
+                return
+            with torch.autocast(device_type="cuda", dtype=self._autocast_dtype):
+                yield
+
+    async def start(self) -> None:
+        self._scheduler.start()
+
+    async def stop(self) -> None:
+        await self._scheduler.stop()
+        self._gpu_exec.shutdown(wait=False, cancel_futures=True)
+        self._cpu_exec.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(
+        self,
+        text: str,
+        voice_id: str = "default",
+        sample_rate: int = 24000,
+    ) -> bytes:
+        """Queue a request on the batch scheduler and wait for its WAV bytes."""
+        return await self._scheduler.submit(text, voice_id, sample_rate)
 
     def list_voices(self) -> list[str]:
         """List available voice profiles (directory names in voices_dir)."""
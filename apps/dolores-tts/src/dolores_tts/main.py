@@ -12,7 +12,7 @@ from dolores_common.logging import setup_logging
 from dolores_common.middleware import add_common_middleware
 
 from .config import settings
-from .routes import router as tts_router, set_engine, set_voice_store
+from .routes import router as tts_router
 from .voice_profiles import VoiceProfileStore
 
 _engine = None
@@ -23,7 +23,14 @@ def _create_engine():
     """Create the appropriate TTS engine based on config."""
     if settings.engine == "coqui_xtts":
         from .engines.coqui_xtts import CoquiXTTSEngine
-        return CoquiXTTSEngine(device=settings.device, voices_dir=settings.voices_dir)
+        return CoquiXTTSEngine(
+            device=settings.device,
+            voices_dir=settings.voices_dir,
+            batch_max_size=settings.batch_max_size,
+            batch_max_delay_ms=settings.batch_max_delay_ms,
+            precision=settings.precision,
+            compile_decoder=settings.compile_decoder,
+        )
     elif settings.engine == "piper":
         from .engines.piper import PiperEngine
         return PiperEngine()
@@ -42,12 +49,17 @@ async def lifespan(app: FastAPI):
 
     _engine = _create_engine()
     _engine.load()
-    set_engine(_engine)
+    await _engine.start()
+    app.state.engine = _engine
 
     await _voice_store.init()
-    set_voice_store(_voice_store)
+    _voice_store.on_delete = _engine.forget_voice
+    app.state.voice_store = _voice_store
+    app.state.ready = _engine.is_loaded
 
     yield
+    app.state.ready = False
+    await _engine.stop()
     await _voice_store.close()
 
 
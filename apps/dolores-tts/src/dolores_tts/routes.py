@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from fastapi.responses import Response
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 
 from dolores_common.auth import ServicePSK
 from dolores_common.logging import get_logger
 
-from .config import settings
 from .engine import TTSEngine
 from .schemas import SynthesizeRequest, VoiceCreateResponse, VoiceProfile
 from .voice_profiles import VoiceProfileStore
@@ -17,30 +18,26 @@ log = get_logger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["tts"])
 
-_engine: TTSEngine | None = None
-_voice_store: VoiceProfileStore | None = None
+# Max 10 MB for reference audio, copied to disk in 1 MiB chunks
+_MAX_REFERENCE_BYTES = 10 * 1024 * 1024
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# The engine and voice store live on app.state; main's lifespan sets them and
+# flips app.state.ready once the model is loaded
 
 
-def get_engine() -> TTSEngine:
-    if _engine is None or not _engine.is_loaded:
+def get_engine(request: Request) -> TTSEngine:
+    state = request.app.state
+    if not getattr(state, "ready", False):
         raise HTTPException(status_code=503, detail="TTS model not loaded yet")
-    return _engine
+    return state.engine
 
 
-def get_voice_store() -> VoiceProfileStore:
-    if _voice_store is None:
+def get_voice_store(request: Request) -> VoiceProfileStore:
+    store = getattr(request.app.state, "voice_store", None)
+    if store is None:
         raise HTTPException(status_code=503, detail="Voice profile store not initialized")
-    return _voice_store
-
-
-def set_engine(engine: TTSEngine) -> None:
-    global _engine
-    _engine = engine
-
-
-def set_voice_store(store: VoiceProfileStore) -> None:
-    global _voice_store
-    _voice_store = store
+    return store
 
 
 @router.post("/synthesize")
@@ -49,16 +46,16 @@ async def synthesize(
     _auth: ServicePSK = None,
     engine: TTSEngine = Depends(get_engine),
 ) -> Response:
-    """Synthesize text to audio. Returns WAV binary."""
-    if len(req.text) > settings.max_text_length:
-        raise HTTPException(status_code=400, detail=f"Text too long. Maximum: {settings.max_text_length} chars")
+    """Synthesize text to audio. Returns WAV binary, chunked if ``stream`` is set."""
+    log.debug("synthesize_request", voice_id=req.voice_id, text_length=len(req.text), stream=req.stream)
 
-    if not req.text.strip():
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    if req.stream:
+        return StreamingResponse(
+            engine.stream(text=req.text, voice_id=req.voice_id, sample_rate=req.sample_rate),
+            media_type="audio/wav",
+        )
 
-    log.info("synthesize_request", voice_id=req.voice_id, text_length=len(req.text))
-
-    wav_bytes = engine.synthesize(
+    wav_bytes = await engine.submit(
         text=req.text,
         voice_id=req.voice_id,
         sample_rate=req.sample_rate,
@@ -67,6 +64,16 @@ async def synthesize(
     return Response(content=wav_bytes, media_type="audio/wav")
 
 
+async def _upload_chunks(file: UploadFile, max_bytes: int) -> AsyncIterator[bytes]:
+    """Yield an upload in chunks, enforcing the size limit incrementally."""
+    size = 0
+    while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail="Reference audio too large. Maximum: 10 MB")
+        yield chunk
+
+
 @router.get("/voices", response_model=list[VoiceProfile])
 async def list_voices(
     _auth: ServicePSK = None,
@@ -79,6 +86,7 @@ async def list_voices(
 
 @router.post("/voices", response_model=VoiceCreateResponse)
 async def create_voice(
+    request: Request,
     name: str,
     file: UploadFile,
     description: str = "",
@@ -89,18 +97,27 @@ async def create_voice(
     if not file.content_type or not file.content_type.startswith("audio/"):
         raise HTTPException(status_code=415, detail="File must be an audio file")
 
-    audio_data = await file.read()
-    if len(audio_data) == 0:
-        raise HTTPException(status_code=400, detail="Empty audio file")
-
-    # Max 10 MB for reference audio
-    if len(audio_data) > 10 * 1024 * 1024:
+    # Size is known once the multipart body is parsed; reject early when it is
+    if file.size is not None and file.size > _MAX_REFERENCE_BYTES:
         raise HTTPException(status_code=413, detail="Reference audio too large. Maximum: 10 MB")
 
-    result = await store.create(
-        name=name,
-        audio_data=audio_data,
-        engine=_engine.name if _engine else "coqui_xtts",
-        description=description,
-    )
+    engine: TTSEngine | None = getattr(request.app.state, "engine", None)
+    try:
+        result = await store.create(
+            name=name,
+            audio_data=_upload_chunks(file, _MAX_REFERENCE_BYTES),
+            engine=engine.name if engine else "coqui_xtts",
+            description=description,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Encode the reference audio once now so the first synthesis with this
+    # voice doesn't read and encode it from disk
+    if getattr(request.app.state, "ready", False):
+        try:
+            await engine.prepare_voice(result["id"])
+        except Exception as e:
+            log.warning("voice_prepare_failed", voice_id=result["id"], error=str(e))
+
     return VoiceCreateResponse(**result)
@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from .config import settings
 
 
 class SynthesizeRequest(BaseModel):
-    text: str = Field(..., max_length=5000)
+    # Length and emptiness are enforced here, so bad input is a 422 before
+    # the handler runs
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True)
+
+    text: str = Field(..., min_length=1, max_length=settings.max_text_length)
     voice_id: str = "default"
     output_format: str = "wav"  # wav or opus (future)
-    sample_rate: int = 24000
+    sample_rate: Literal[16000, 22050, 24000, 44100, 48000] = 24000  # XTTS is 24 kHz native
+    stream: bool = False  # chunked WAV as audio is generated
+
+    @model_validator(mode="after")
+    def _stream_at_native_rate(self) -> SynthesizeRequest:
+        # Resampling chunk by chunk would click at every chunk boundary
+        if self.stream and self.sample_rate != 24000:
+            raise ValueError("stream requires sample_rate 24000")
+        return self
 
 
 class VoiceProfile(BaseModel):
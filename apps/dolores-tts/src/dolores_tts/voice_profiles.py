@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import shutil
 import uuid
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -23,6 +24,23 @@ CREATE TABLE IF NOT EXISTS voice_profiles (
 );
 """
 
+# WAL lets /v1/voices reads proceed during writes; NORMAL sync is durable under WAL
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=134217728",
+)
+
+# Kept as constants so SQLite's statement cache sees identical SQL text
+_INSERT_PROFILE = (
+    "INSERT INTO voice_profiles (id, name, description, engine, created_at) VALUES (?, ?, ?, ?, ?)"
+)
+_LIST_PROFILES = (
+    "SELECT id, name, description, engine, created_at FROM voice_profiles ORDER BY created_at DESC"
+)
+_DELETE_PROFILE = "DELETE FROM voice_profiles WHERE id = ?"
+
 
 class VoiceProfileStore:
     """Manages voice profiles: reference audio on disk, metadata in SQLite."""
@@ -31,10 +49,17 @@ class VoiceProfileStore:
         self._voices_dir = Path(voices_dir)
         self._db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        # Called with the profile id after delete, e.g. to drop engine caches
+        self.on_delete: Callable[[str], None] | None = None
+        # list_profiles() result, valid while _version is unchanged
+        self._profiles: list[dict] | None = None
+        self._version = 0
 
     async def init(self) -> None:
         self._voices_dir.mkdir(parents=True, exist_ok=True)
         self._db = await aiosqlite.connect(self._db_path)
+        for pragma in _PRAGMAS:
+            await self._db.execute(pragma)
         await self._db.execute(_CREATE_TABLE)
         await self._db.commit()
         log.info("voice_profile_store_ready")
@@ -44,37 +69,64 @@ class VoiceProfileStore:
             await self._db.close()
 
     async def create(
-        self, name: str, audio_data: bytes, engine: str = "coqui_xtts", description: str = ""
+        self,
+        name: str,
+        audio_data: bytes | AsyncIterator[bytes],
+        engine: str = "coqui_xtts",
+        description: str = "",
     ) -> dict:
-        """Create a new voice profile from reference audio."""
+        """Create a new voice profile from reference audio.
+
+        ``audio_data`` may be an async iterator of chunks, which is written to
+        disk as it arrives instead of being held in memory. Raises ValueError
+        if it yields no data.
+        """
         profile_id = str(uuid.uuid4())[:8]
         profile_dir = self._voices_dir / profile_id
         profile_dir.mkdir(parents=True, exist_ok=True)
 
         # Save reference audio
         ref_path = profile_dir / "reference.wav"
-        ref_path.write_bytes(audio_data)
+        if isinstance(audio_data, bytes):
+            ref_path.write_bytes(audio_data)
+        else:
+            try:
+                size = 0
+                with ref_path.open("wb") as f:
+                    async for chunk in audio_data:
+                        f.write(chunk)
+                        size += len(chunk)
+                if size == 0:
+                    raise ValueError("Empty audio file")
+            except BaseException:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+                raise
 
         now = datetime.now(timezone.utc).isoformat()
-        await self._db.execute(
-            "INSERT INTO voice_profiles (id, name, description, engine, created_at) VALUES (?, ?, ?, ?, ?)",
-            (profile_id, name, description, engine, now),
-        )
+        await self._db.execute(_INSERT_PROFILE, (profile_id, name, description, engine, now))
         await self._db.commit()
+        self._version += 1
+        self._profiles = None
 
         log.info("voice_profile_created", id=profile_id, name=name)
         return {"id": profile_id, "name": name, "engine": engine}
 
     async def list_profiles(self) -> list[dict]:
         """List all voice profiles."""
-        cursor = await self._db.execute(
-            "SELECT id, name, description, engine, created_at FROM voice_profiles ORDER BY created_at DESC"
-        )
+        if self._profiles is not None:
+            return list(self._profiles)
+
+        version = self._version
+        cursor = await self._db.execute(_LIST_PROFILES)
         rows = await cursor.fetchall()
-        return [
+        profiles = [
             {"id": r[0], "name": r[1], "description": r[2], "engine": r[3], "created_at": r[4]}
             for r in rows
         ]
+        # Don't cache a result that raced with a create/delete
+        if version == self._version:
+            self._profiles = profiles
+        return list(profiles)
 
     async def delete(self, profile_id: str) -> bool:
         """Delete a voice profile."""
@@ -82,8 +134,10 @@ class VoiceProfileStore:
         if profile_dir.exists():
             shutil.rmtree(profile_dir)
 
-        cursor = await self._db.execute(
-            "DELETE FROM voice_profiles WHERE id = ?", (profile_id,)
-        )
+        cursor = await self._db.execute(_DELETE_PROFILE, (profile_id,))
         await self._db.commit()
+        self._version += 1
+        self._profiles = None
+        if self.on_delete is not None:
+            self.on_delete(profile_id)
         return cursor.rowcount > 0
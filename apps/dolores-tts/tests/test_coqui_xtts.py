@@ -0,0 +1,90 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from dolores_tts.engines.coqui_xtts import CoquiXTTSEngine
+from dolores_tts.schemas import SynthesizeRequest
+
+
+class FakeXtts:
+    """Stands in for the XTTS model and records how its calls overlap."""
+
+    def __init__(self) -> None:
+        self.streaming = False
+        self.events: list[str] = []
+
+    def inference_stream(self, text, language, gpt_cond_latent, speaker_embedding, **kwargs):
+        self.streaming = True
+        try:
+            for _ in range(3):
+                time.sleep(0.02)
+                self.events.append("chunk")
+                yield [0.0] * 16
+        finally:
+            self.streaming = False
+
+    def inference(self, text, language, gpt_cond_latent, speaker_embedding, **kwargs):
+        assert not self.streaming, "model call interleaved with a stream"
+        self.events.append("decode")
+        return {"wav": [0.0] * 16}
+
+
+def _engine() -> tuple[CoquiXTTSEngine, FakeXtts]:
+    engine = CoquiXTTSEngine()
+    xtts = FakeXtts()
+    engine._model = object()
+    engine._xtts = xtts
+    engine._inference = contextlib.nullcontext
+    engine._latents["default"] = (None, None)
+    return engine, xtts
+
+
+def test_stream_has_exclusive_use_of_the_model():
+    async def run():
+        engine, xtts = _engine()
+        await engine.start()
+        try:
+            stream = engine.stream("Hello there.")
+            header = await anext(stream)
+            first = await anext(stream)
+            submitted = asyncio.create_task(engine.submit("Meanwhile."))
+            rest = [chunk async for chunk in stream]
+
+            assert len(header) == 44
+            assert len(first) == 32
+            assert len(rest) == 2
+            assert (await submitted)[:4] == b"RIFF"
+            assert xtts.events == ["chunk", "chunk", "chunk", "decode"]
+        finally:
+            await engine.stop()
+
+    asyncio.run(run())
+
+
+def test_stream_stops_generating_when_abandoned():
+    async def run():
+        engine, xtts = _engine()
+        await engine.start()
+        try:
+            stream = engine.stream("Hello there.")
+            await anext(stream)
+            await anext(stream)
+            await stream.aclose()
+
+            await engine.submit("Next.")
+            assert xtts.events.count("chunk") < 3
+            assert not xtts.streaming
+        finally:
+            await engine.stop()
+
+    asyncio.run(run())
+
+
+def test_stream_rejects_non_native_sample_rate():
+    assert SynthesizeRequest(text="Hi", stream=True).sample_rate == 24000
+    assert SynthesizeRequest(text="Hi", sample_rate=16000).sample_rate == 16000
+    with pytest.raises(ValidationError):
+        SynthesizeRequest(text="Hi", stream=True, sample_rate=16000)
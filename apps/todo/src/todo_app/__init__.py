@@ -31,7 +31,11 @@ def create_app(test_config: dict | None = None) -> Flask:
         database_url = app.config["DATABASE_URL"]
         if not database_url:
             raise ValueError("DATABASE_URL is required when STORAGE_BACKEND=postgres")
-        store = PostgresStore(database_url)
+        store = PostgresStore(
+            database_url,
+            pool_size=app.config["DB_POOL_SIZE"],
+            max_overflow=app.config["DB_MAX_OVERFLOW"],
+        )
         store.init_db()
         app.config["MULTIUSER"] = True
     else:
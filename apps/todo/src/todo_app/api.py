@@ -1,24 +1,91 @@
-from flask import Blueprint, current_app, jsonify, request, session
+import orjson
+from flask import Blueprint, current_app, g, request, session
 from .storage import ValidationError
+from . import jwt_auth_cache
 from .jwt_auth import validate_bearer_token
 
 api_bp = Blueprint("api", __name__)
 
+# Constant error bodies, serialized once. Each request still gets its own
+# Response: after_request hooks (e.g. the session cookie) mutate it.
+_AUTH_REQUIRED_BODY = orjson.dumps({"error": "authentication required"})
+_NOT_FOUND_BODY = orjson.dumps({"error": "not found"})
+_EMPTY_LIST_BODY = b"[]"
+
 
 def store():
     return current_app.extensions["store"]
 
 
+def ojsonify(obj, status: int = 200):
+    """Like ``jsonify``, but serialized with orjson (much faster on large lists)."""
+    return current_app.response_class(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+def list_response(kind: str):
+    """List endpoint body; uses the store's pre-serialized JSON when it has one."""
+    store_inst = store()
+    user_id = get_user_id()
+    list_json = getattr(store_inst, f"list_{kind}_json", None)
+    if list_json is not None:
+        return current_app.response_class(list_json(user_id=user_id), mimetype="application/json")
+    items = getattr(store_inst, f"list_{kind}")(user_id=user_id)
+    if not items:
+        # Common for new users in multiuser mode; skip serialization
+        return current_app.response_class(_EMPTY_LIST_BODY, mimetype="application/json")
+    return ojsonify(items)
+
+
+def auth_required():
+    return current_app.response_class(_AUTH_REQUIRED_BODY, status=401, mimetype="application/json")
+
+
+def not_found():
+    return current_app.response_class(_NOT_FOUND_BODY, status=404, mimetype="application/json")
+
+
+def json_body() -> dict:
+    """Parse the request body as a JSON object, ignoring content type.
+
+    Empty, invalid or non-object bodies yield {}, which the stores reject
+    with a ValidationError (400).
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 def get_user_from_bearer() -> dict | None:
     """Extract and validate a Bearer token from the Authorization header.
 
-    Returns user info dict (sub, email, name, groups) or None.
+    Returns user info dict (sub, email, name, groups, exp) or None.
+    The result is memoized on ``g`` for the rest of the request.
     """
+    if "bearer_user" not in g:
+        g.bearer_user = _validate_bearer_header()
+    return g.bearer_user
+
+
+def _validate_bearer_header() -> dict | None:
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         return None
     token = auth_header[7:]  # Strip "Bearer " prefix
-    return validate_bearer_token(token)
+
+    cache = jwt_auth_cache.get_cache()
+    if cache is None:
+        return validate_bearer_token(token)
+    user = cache.get(token)
+    if user is None:
+        user = validate_bearer_token(token)
+        if user is not None:
+            cache.put(token, user)
+    return user
 
 
 def get_user_id():
@@ -26,10 +93,16 @@ def get_user_id():
 
     Priority: Bearer token > session cookie.
     Returns user sub (str) or None for single-user JSON mode.
+    Resolved once per request and memoized on ``g``.
     """
     if not current_app.config.get("MULTIUSER"):
         return None
+    if "user_id" not in g:
+        g.user_id = _resolve_user_id()
+    return g.user_id
+
 
+def _resolve_user_id():
     # Try bearer token first (mobile/API clients)
     bearer_user = get_user_from_bearer()
     if bearer_user:
@@ -68,173 +141,147 @@ def require_auth():
     if session.get("user"):
         return None
 
-    return jsonify({"error": "authentication required"}), 401
+    return auth_required()
+
+
+@api_bp.before_request
+def authenticate():
+    """Reject unauthenticated API requests before any view runs."""
+    return require_auth()
 
 
 # ---- Todos ----
 @api_bp.get("/todos")
 def api_list_todos():
-    if err := require_auth():
-        return err
-    return jsonify(store().list_todos(user_id=get_user_id()))
+    return list_response("todos")
 
 
 @api_bp.post("/todos")
 def api_create_todo():
-    if err := require_auth():
-        return err
-    data = request.get_json(force=True, silent=True) or {}
+    data = json_body()
     try:
         item = store().create_todo(data, user_id=get_user_id())
-        return jsonify(item), 201
+        return ojsonify(item), 201
     except ValidationError as e:
-        return jsonify({"error": str(e)}), 400
+        return ojsonify({"error": str(e)}), 400
 
 
 @api_bp.get("/todos/<tid>")
 def api_get_todo(tid):
-    if err := require_auth():
-        return err
     item = store().get_todo(tid, user_id=get_user_id())
     if not item:
-        return jsonify({"error": "not found"}), 404
-    return jsonify(item)
+        return not_found()
+    return ojsonify(item)
 
 
 @api_bp.put("/todos/<tid>")
 @api_bp.patch("/todos/<tid>")
 def api_update_todo(tid):
-    if err := require_auth():
-        return err
-    data = request.get_json(force=True, silent=True) or {}
+    data = json_body()
     try:
         item = store().update_todo(tid, data, user_id=get_user_id())
         if not item:
-            return jsonify({"error": "not found"}), 404
-        return jsonify(item)
+            return not_found()
+        return ojsonify(item)
     except ValidationError as e:
-        return jsonify({"error": str(e)}), 400
+        return ojsonify({"error": str(e)}), 400
 
 
 @api_bp.delete("/todos/<tid>")
 def api_delete_todo(tid):
-    if err := require_auth():
-        return err
     ok = store().delete_todo(tid, user_id=get_user_id())
-    return ("", 204) if ok else (jsonify({"error": "not found"}), 404)
+    return ("", 204) if ok else not_found()
 
 
 @api_bp.post("/todos/<tid>/done")
 def api_mark_done(tid):
-    if err := require_auth():
-        return err
     item = store().update_todo(tid, {"done": True}, user_id=get_user_id())
     if not item:
-        return jsonify({"error": "not found"}), 404
-    return jsonify(item)
+        return not_found()
+    return ojsonify(item)
 
 
 # ---- Notes ----
 @api_bp.get("/notes")
 def api_list_notes():
-    if err := require_auth():
-        return err
-    return jsonify(store().list_notes(user_id=get_user_id()))
+    return list_response("notes")
 
 
 @api_bp.post("/notes")
 def api_create_note():
-    if err := require_auth():
-        return err
-    data = request.get_json(force=True, silent=True) or {}
+    data = json_body()
     try:
         item = store().create_note(data, user_id=get_user_id())
-        return jsonify(item), 201
+        return ojsonify(item), 201
     except ValidationError as e:
-        return jsonify({"error": str(e)}), 400
+        return ojsonify({"error": str(e)}), 400
 
 
 @api_bp.get("/notes/<nid>")
 def api_get_note(nid):
-    if err := require_auth():
-        return err
     item = store().get_note(nid, user_id=get_user_id())
     if not item:
-        return jsonify({"error": "not found"}), 404
-    return jsonify(item)
+        return not_found()
+    return ojsonify(item)
 
 
 @api_bp.put("/notes/<nid>")
 @api_bp.patch("/notes/<nid>")
 def api_update_note(nid):
-    if err := require_auth():
-        return err
-    data = request.get_json(force=True, silent=True) or {}
+    data = json_body()
     try:
         item = store().update_note(nid, data, user_id=get_user_id())
         if not item:
-            return jsonify({"error": "not found"}), 404
-        return jsonify(item)
+            return not_found()
+        return ojsonify(item)
     except ValidationError as e:
-        return jsonify({"error": str(e)}), 400
+        return ojsonify({"error": str(e)}), 400
 
 
 @api_bp.delete("/notes/<nid>")
 def api_delete_note(nid):
-    if err := require_auth():
-        return err
     ok = store().delete_note(nid, user_id=get_user_id())
-    return ("", 204) if ok else (jsonify({"error": "not found"}), 404)
+    return ("", 204) if ok else not_found()
 
 
 # ---- Work Items ----
 @api_bp.get("/work")
 def api_list_work():
-    if err := require_auth():
-        return err
-    return jsonify(store().list_work(user_id=get_user_id()))
+    return list_response("work")
 
 
 @api_bp.post("/work")
 def api_create_work():
-    if err := require_auth():
-        return err
-    data = request.get_json(force=True, silent=True) or {}
+    data = json_body()
     try:
         item = store().create_work(data, user_id=get_user_id())
-        return jsonify(item), 201
+        return ojsonify(item), 201
     except ValidationError as e:
-        return jsonify({"error": str(e)}), 400
+        return ojsonify({"error": str(e)}), 400
 
 
 @api_bp.get("/work/<wid>")
 def api_get_work(wid):
-    if err := require_auth():
-        return err
     item = store().get_work(wid, user_id=get_user_id())
     if not item:
-        return jsonify({"error": "not found"}), 404
-    return jsonify(item)
+        return not_found()
+    return ojsonify(item)
 
 
 @api_bp.put("/work/<wid>")
 @api_bp.patch("/work/<wid>")
 def api_update_work(wid):
-    if err := require_auth():
-        return err
-    data = request.get_json(force=True, silent=True) or {}
+    data = json_body()
     try:
         item = store().update_work(wid, data, user_id=get_user_id())
         if not item:
-            return jsonify({"error": "not found"}), 404
-        return jsonify(item)
+            return not_found()
+        return ojsonify(item)
     except ValidationError as e:
-        return jsonify({"error": str(e)}), 400
+        return ojsonify({"error": str(e)}), 400
 
 
 @api_bp.delete("/work/<wid>")
 def api_delete_work(wid):
-    if err := require_auth():
-        return err
     ok = store().delete_work(wid, user_id=get_user_id())
-    return ("", 204) if ok else (jsonify({"error": "not found"}), 404)
+    return ("", 204) if ok else not_found()
@@ -1,12 +1,12 @@
 import os
-from dataclasses import dataclass
 
 
 def env(key: str, default: str) -> str:
     return os.getenv(key, default)
 
 
-@dataclass
+# Plain class: Flask's from_object() only reads its UPPERCASE attributes, so
+# dataclass machinery would be generated at import for nothing
 class Config:
     # Storage backend: "json" (default for dev) or "postgres" (production with multiuser)
     # When DATABASE_URL is set, defaults to "postgres"; otherwise defaults to "json"
@@ -19,6 +19,9 @@ class Config:
 
     # PostgreSQL storage (used when STORAGE_BACKEND=postgres, multiuser production)
     DATABASE_URL: str = env("DATABASE_URL", "")
+    # Connections per worker process; size for the gunicorn worker's concurrency
+    DB_POOL_SIZE: int = int(env("DB_POOL_SIZE", "6"))
+    DB_MAX_OVERFLOW: int = int(env("DB_MAX_OVERFLOW", "12"))
 
     SECRET_KEY: str = env("SECRET_KEY", "dev-secret-key")
 
@@ -37,3 +40,9 @@ class Config:
 
     # Additional JWT issuers for mobile/API clients (comma-separated "issuer_url|client_id" pairs)
     OIDC_JWT_ISSUERS: str = env("OIDC_JWT_ISSUERS", "")
+
+    # Cache validated bearer tokens briefly (seconds; never past the token's exp).
+    # Like the other flags, only "1" enables it
+    JWT_CACHE_ENABLED: bool = env("JWT_CACHE_ENABLED", "1") == "1"
+    JWT_CACHE_TTL: float = float(env("JWT_CACHE_TTL", "60"))
+    JWT_CACHE_SIZE: int = int(env("JWT_CACHE_SIZE", "4096"))
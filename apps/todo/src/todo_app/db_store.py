@@ -1,60 +1,83 @@
 """PostgreSQL storage backend with multiuser support."""
 from __future__ import annotations
-from datetime import date
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import Text, cast, create_engine, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from .models import Base, User, Todo, Note, WorkItem
-from .storage import ValidationError, PRIORITIES
+from .storage import ValidationError, parse_iso_date, validate_tags
+
+
+TODO_FIELDS = ("title", "description", "tags", "done", "due_date")
+NOTE_FIELDS = ("title", "note", "tags")
+WORK_FIELDS = ("name", "start_date", "end_date", "description", "why")
+
+# Timestamp format used by the models' to_dict()
+_PG_TS_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS"Z"'
+
+# Users confirmed to exist in the DB: user_id -> (expires_at, email, name)
+KNOWN_USERS_MAX = 10000
+KNOWN_USERS_TTL = 300.0
 
 
 class PostgresStore:
     """PostgreSQL-backed storage with user isolation."""
 
-    def __init__(self, database_url: str):
-        self.engine = create_engine(database_url, echo=False, pool_pre_ping=True)
-        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+    def __init__(self, database_url: str, pool_size: int = 6, max_overflow: int = 12):
+        self.engine = create_engine(
+            database_url,
+            echo=False,
+            pool_pre_ping=True,
+            # Reuse the most recently returned connection so idle ones can be recycled
+            pool_use_lifo=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+        )
+        # Every write path commits explicitly (which flushes), so autoflush only
+        # adds flush checks before each query
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False, autoflush=False)
+        self._known_users: OrderedDict[str, tuple[float, str | None, str | None]] = OrderedDict()
+        self._known_users_lock = threading.Lock()
 
     def init_db(self):
-        """Create all tables if they don't exist."""
+        """Create all tables and indexes if they don't exist."""
         Base.metadata.create_all(self.engine)
+        # create_all skips existing tables, including indexes added to them later
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
 
     def get_session(self) -> Session:
         return self.SessionLocal()
 
     # ---------- Validation ----------
     def _validate_tags(self, tags: Dict[str, str]):
-        if not isinstance(tags, dict):
-            raise ValidationError("tags must be a dict")
-        required = ["category", "priority"]
-        for r in required:
-            if r not in tags or not isinstance(tags[r], str) or not tags[r].strip():
-                raise ValidationError(f"missing required tag: {r}")
-        if tags.get("priority") not in PRIORITIES:
-            raise ValidationError("priority must be one of: low, medium, high, urgent")
-        for k, v in tags.items():
-            if not isinstance(k, str) or not isinstance(v, str):
-                raise ValidationError("tags must be a str->str dict")
+        validate_tags(tags)
 
     def _validate_todo(self, data: Dict[str, Any], for_update: bool = False):
+        """Validate a new todo, or just the fields present in an update."""
         if not for_update:
             if not data.get("title"):
                 raise ValidationError("title is required")
-        tags = data.get("tags", {})
-        self._validate_tags(tags)
+        if not for_update or "tags" in data:
+            self._validate_tags(data.get("tags", {}))
         if data.get("due_date"):
             dd = data["due_date"]
             if not isinstance(dd, str):
                 raise ValidationError("due_date must be string in YYYY-MM-DD or ISO format")
 
     def _validate_note(self, data: Dict[str, Any], for_update: bool = False):
+        """Validate a new note, or just the fields present in an update."""
         if not for_update:
             if not data.get("title"):
                 raise ValidationError("title is required")
-        tags = data.get("tags", {})
-        self._validate_tags(tags)
+        if not for_update or "tags" in data:
+            self._validate_tags(data.get("tags", {}))
 
     def _validate_work(self, data: Dict[str, Any], for_update: bool = False):
         name = (data.get("name") or "").strip()
@@ -63,24 +86,74 @@ class PostgresStore:
         sd = data.get("start_date")
         if not isinstance(sd, str) or not sd:
             raise ValidationError("start_date is required (YYYY-MM-DD)")
-        try:
-            sdate = date.fromisoformat(sd[:10])
-        except Exception:
+        sdate = parse_iso_date(sd)
+        if sdate is None:
             raise ValidationError("start_date must be YYYY-MM-DD")
         ed = data.get("end_date")
         if ed:
             if not isinstance(ed, str):
                 raise ValidationError("end_date must be string YYYY-MM-DD")
-            try:
-                edate = date.fromisoformat(ed[:10])
-            except Exception:
+            edate = parse_iso_date(ed)
+            if edate is None:
                 raise ValidationError("end_date must be YYYY-MM-DD")
             if edate < sdate:
                 raise ValidationError("end_date cannot be earlier than start_date")
 
+    def _update_returning(self, session: Session, model, obj_id: str, user_id: str | None, values: Dict[str, Any]):
+        """UPDATE one row and return the updated ORM object (or None) in a single round-trip."""
+        where = [model.id == obj_id]
+        if user_id:
+            where.append(model.user_id == user_id)
+        if not values:
+            return session.scalar(select(model).where(*where))
+        stmt = update(model).where(*where).values(**values).returning(model)
+        obj = session.scalar(stmt)
+        session.commit()
+        return obj
+
+    def _list_json(self, model, fields: Tuple[str, ...], user_id: str | None) -> bytes:
+        """List rows as a JSON array built by Postgres, matching ``to_dict()``.
+
+        Skips ORM hydration and per-row to_dict(); other dialects (e.g.
+        SQLite in tests) load the rows and encode them with ``model.dump_list``.
+        """
+        if self.engine.dialect.name != "postgresql":
+            query = select(model)
+            if user_id:
+                query = query.where(model.user_id == user_id)
+            with self.get_session() as session:
+                rows = session.scalars(query).all()
+                return model.dump_list(rows) if rows else b"[]"
+        args = []
+        for name in ("id", *fields, "created_at", "updated_at"):
+            col = getattr(model, name)
+            if name in ("created_at", "updated_at"):
+                col = func.to_char(func.timezone("UTC", col), _PG_TS_FORMAT)
+            elif name == "tags":
+                col = func.coalesce(col, func.json_build_object())
+            args += [name, col]
+        # ::text so the driver hands back the string instead of parsing the JSON
+        rows = func.json_agg(func.json_build_object(*args))
+        query = select(func.coalesce(cast(rows, Text), "[]")).select_from(model)
+        if user_id:
+            query = query.where(model.user_id == user_id)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar_one().encode()
+
     # ---------- User Management ----------
     def get_or_create_user(self, user_id: str, email: str | None = None, name: str | None = None) -> User:
-        """Get existing user or create new one."""
+        """Get existing user or create new one.
+
+        Users seen recently with the same email/name are answered from an
+        in-process cache without touching the DB; the returned User is then
+        a detached stub carrying only id, email and name.
+        """
+        known = self._known_user(user_id)
+        if known is not None:
+            _, known_email, known_name = known
+            if (not email or email == known_email) and (not name or name == known_name):
+                return User(id=user_id, email=known_email, name=known_name)
+
         with self.get_session() as session:
             user = session.get(User, user_id)
             if not user:
@@ -88,7 +161,7 @@ class PostgresStore:
                 session.add(user)
                 session.commit()
                 session.refresh(user)
-            elif email or name:
+            elif (email and email != user.email) or (name and name != user.name):
                 # Update user info if provided
                 if email:
                     user.email = email
@@ -96,8 +169,42 @@ class PostgresStore:
                     user.name = name
                 session.commit()
                 session.refresh(user)
+            self._remember_user(user)
             return user
 
+    def _ensure_user(self, session: Session, user_id: str) -> None:
+        """Create the user row if missing, inside the caller's transaction.
+
+        Known users are skipped; otherwise ON CONFLICT DO NOTHING replaces the
+        existence check. The caller's commit makes the user known.
+        """
+        if self._known_user(user_id) is None:
+            session.execute(pg_insert(User).values(id=user_id).on_conflict_do_nothing(index_elements=[User.id]))
+
+    def _known_user(self, user_id: str) -> tuple[float, str | None, str | None] | None:
+        with self._known_users_lock:
+            entry = self._known_users.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._known_users[user_id]
+                return None
+            self._known_users.move_to_end(user_id)
+            return entry
+
+    def _remember_user(self, user: User) -> None:
+        self._remember_user_id(user.id, user.email, user.name)
+
+    def _remember_user_id(self, user_id: str, email: str | None = None, name: str | None = None) -> None:
+        with self._known_users_lock:
+            if email is None and name is None and user_id in self._known_users:
+                # Only existence was confirmed; keep the cached profile
+                _, email, name = self._known_users[user_id]
+            self._known_users[user_id] = (time.monotonic() + KNOWN_USERS_TTL, email, name)
+            self._known_users.move_to_end(user_id)
+            while len(self._known_users) > KNOWN_USERS_MAX:
+                self._known_users.popitem(last=False)
+
     # ---------- Health Check ----------
     def validate_store(self) -> Tuple[bool, str]:
         try:
@@ -108,12 +215,15 @@ class PostgresStore:
             return False, str(e)
 
     # ---------- Todos ----------
+    def list_todos_json(self, user_id: str | None = None) -> bytes:
+        return self._list_json(Todo, TODO_FIELDS, user_id)
+
     def list_todos(self, user_id: str | None = None) -> List[Dict[str, Any]]:
         with self.get_session() as session:
             query = select(Todo)
             if user_id:
                 query = query.where(Todo.user_id == user_id)
-            todos = session.execute(query).scalars().all()
+            todos = session.scalars(query).all()
             return [t.to_dict() for t in todos]
 
     def get_todo(self, tid: str, user_id: str | None = None) -> Optional[Dict[str, Any]]:
@@ -121,14 +231,13 @@ class PostgresStore:
             query = select(Todo).where(Todo.id == tid)
             if user_id:
                 query = query.where(Todo.user_id == user_id)
-            todo = session.execute(query).scalar_one_or_none()
+            todo = session.scalar(query)
             return todo.to_dict() if todo else None
 
     def create_todo(self, data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         self._validate_todo(data)
         with self.get_session() as session:
-            # Ensure user exists
-            self.get_or_create_user(user_id)
+            self._ensure_user(session, user_id)
             todo = Todo(
                 user_id=user_id,
                 title=data["title"],
@@ -139,45 +248,24 @@ class PostgresStore:
             )
             session.add(todo)
             session.commit()
+            self._remember_user_id(user_id)
             session.refresh(todo)
             return todo.to_dict()
 
     def update_todo(self, tid: str, data: Dict[str, Any], user_id: str | None = None) -> Optional[Dict[str, Any]]:
+        # Stored fields were validated on write, so only the incoming ones need checking
+        self._validate_todo({k: v for k, v in data.items() if v is not None}, for_update=True)
+        values = {k: data[k] for k in TODO_FIELDS if k in data}
         with self.get_session() as session:
-            query = select(Todo).where(Todo.id == tid)
-            if user_id:
-                query = query.where(Todo.user_id == user_id)
-            todo = session.execute(query).scalar_one_or_none()
-            if not todo:
-                return None
-
-            # Merge data
-            merged = todo.to_dict()
-            merged.update({k: v for k, v in data.items() if v is not None})
-            self._validate_todo(merged, for_update=True)
-
-            # Apply updates
-            if "title" in data:
-                todo.title = data["title"]
-            if "description" in data:
-                todo.description = data["description"]
-            if "tags" in data:
-                todo.tags = data["tags"]
-            if "done" in data:
-                todo.done = data["done"]
-            if "due_date" in data:
-                todo.due_date = data["due_date"]
-
-            session.commit()
-            session.refresh(todo)
-            return todo.to_dict()
+            todo = self._update_returning(session, Todo, tid, user_id, values)
+            return todo.to_dict() if todo else None
 
     def delete_todo(self, tid: str, user_id: str | None = None) -> bool:
         with self.get_session() as session:
             query = select(Todo).where(Todo.id == tid)
             if user_id:
                 query = query.where(Todo.user_id == user_id)
-            todo = session.execute(query).scalar_one_or_none()
+            todo = session.scalar(query)
             if not todo:
                 return False
             session.delete(todo)
@@ -185,12 +273,15 @@ class PostgresStore:
             return True
 
     # ---------- Notes ----------
+    def list_notes_json(self, user_id: str | None = None) -> bytes:
+        return self._list_json(Note, NOTE_FIELDS, user_id)
+
     def list_notes(self, user_id: str | None = None) -> List[Dict[str, Any]]:
         with self.get_session() as session:
             query = select(Note)
             if user_id:
                 query = query.where(Note.user_id == user_id)
-            notes = session.execute(query).scalars().all()
+            notes = session.scalars(query).all()
             return [n.to_dict() for n in notes]
 
     def get_note(self, nid: str, user_id: str | None = None) -> Optional[Dict[str, Any]]:
@@ -198,13 +289,13 @@ class PostgresStore:
             query = select(Note).where(Note.id == nid)
             if user_id:
                 query = query.where(Note.user_id == user_id)
-            note = session.execute(query).scalar_one_or_none()
+            note = session.scalar(query)
             return note.to_dict() if note else None
 
     def create_note(self, data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         self._validate_note(data)
         with self.get_session() as session:
-            self.get_or_create_user(user_id)
+            self._ensure_user(session, user_id)
             note = Note(
                 user_id=user_id,
                 title=data["title"],
@@ -213,39 +304,23 @@ class PostgresStore:
             )
             session.add(note)
             session.commit()
+            self._remember_user_id(user_id)
             session.refresh(note)
             return note.to_dict()
 
     def update_note(self, nid: str, data: Dict[str, Any], user_id: str | None = None) -> Optional[Dict[str, Any]]:
+        self._validate_note({k: v for k, v in data.items() if v is not None}, for_update=True)
+        values = {k: data[k] for k in NOTE_FIELDS if k in data}
         with self.get_session() as session:
-            query = select(Note).where(Note.id == nid)
-            if user_id:
-                query = query.where(Note.user_id == user_id)
-            note = session.execute(query).scalar_one_or_none()
-            if not note:
-                return None
-
-            merged = note.to_dict()
-            merged.update({k: v for k, v in data.items() if v is not None})
-            self._validate_note(merged, for_update=True)
-
-            if "title" in data:
-                note.title = data["title"]
-            if "note" in data:
-                note.note = data["note"]
-            if "tags" in data:
-                note.tags = data["tags"]
-
-            session.commit()
-            session.refresh(note)
-            return note.to_dict()
+            note = self._update_returning(session, Note, nid, user_id, values)
+            return note.to_dict() if note else None
 
     def delete_note(self, nid: str, user_id: str | None = None) -> bool:
         with self.get_session() as session:
             query = select(Note).where(Note.id == nid)
             if user_id:
                 query = query.where(Note.user_id == user_id)
-            note = session.execute(query).scalar_one_or_none()
+            note = session.scalar(query)
             if not note:
                 return False
             session.delete(note)
@@ -253,12 +328,15 @@ class PostgresStore:
             return True
 
     # ---------- Work Items ----------
+    def list_work_json(self, user_id: str | None = None) -> bytes:
+        return self._list_json(WorkItem, WORK_FIELDS, user_id)
+
     def list_work(self, user_id: str | None = None) -> List[Dict[str, Any]]:
         with self.get_session() as session:
             query = select(WorkItem)
             if user_id:
                 query = query.where(WorkItem.user_id == user_id)
-            items = session.execute(query).scalars().all()
+            items = session.scalars(query).all()
             return [w.to_dict() for w in items]
 
     def get_work(self, wid: str, user_id: str | None = None) -> Optional[Dict[str, Any]]:
@@ -266,13 +344,13 @@ class PostgresStore:
             query = select(WorkItem).where(WorkItem.id == wid)
             if user_id:
                 query = query.where(WorkItem.user_id == user_id)
-            item = session.execute(query).scalar_one_or_none()
+            item = session.scalar(query)
             return item.to_dict() if item else None
 
     def create_work(self, data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         self._validate_work(data)
         with self.get_session() as session:
-            self.get_or_create_user(user_id)
+            self._ensure_user(session, user_id)
             item = WorkItem(
                 user_id=user_id,
                 name=data["name"],
@@ -283,43 +361,30 @@ class PostgresStore:
             )
             session.add(item)
             session.commit()
+            self._remember_user_id(user_id)
             session.refresh(item)
             return item.to_dict()
 
     def update_work(self, wid: str, data: Dict[str, Any], user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        with self.get_session() as session:
-            query = select(WorkItem).where(WorkItem.id == wid)
-            if user_id:
-                query = query.where(WorkItem.user_id == user_id)
-            item = session.execute(query).scalar_one_or_none()
-            if not item:
+        updates = {k: v for k, v in data.items() if v is not None}
+        if not all(k in updates for k in ("name", "start_date", "end_date")):
+            # Name and date-range checks need the stored row
+            current = self.get_work(wid, user_id=user_id)
+            if not current:
                 return None
-
-            merged = item.to_dict()
-            merged.update({k: v for k, v in data.items() if v is not None})
-            self._validate_work(merged, for_update=True)
-
-            if "name" in data:
-                item.name = data["name"]
-            if "start_date" in data:
-                item.start_date = data["start_date"]
-            if "end_date" in data:
-                item.end_date = data["end_date"]
-            if "description" in data:
-                item.description = data["description"]
-            if "why" in data:
-                item.why = data["why"]
-
-            session.commit()
-            session.refresh(item)
-            return item.to_dict()
+            updates = {**current, **updates}
+        self._validate_work(updates, for_update=True)
+        values = {k: data[k] for k in WORK_FIELDS if k in data}
+        with self.get_session() as session:
+            item = self._update_returning(session, WorkItem, wid, user_id, values)
+            return item.to_dict() if item else None
 
     def delete_work(self, wid: str, user_id: str | None = None) -> bool:
         with self.get_session() as session:
             query = select(WorkItem).where(WorkItem.id == wid)
             if user_id:
                 query = query.where(WorkItem.user_id == user_id)
-            item = session.execute(query).scalar_one_or_none()
+            item = session.scalar(query)
             if not item:
                 return False
             session.delete(item)
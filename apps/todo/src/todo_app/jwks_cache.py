@@ -0,0 +1,107 @@
+"""JWKS cache holding ready-to-use public keys, indexed by ``kid``.
+
+Keys are parsed into ``cryptography`` key objects once per JWKS download,
+so token validation never re-parses a JWK. When the cache goes stale the
+JWKS is revalidated with ``If-None-Match``; an unchanged set (304) just
+extends the lifetime. An unknown ``kid`` triggers at most one refresh per
+MIN_REFRESH_INTERVAL, so forged kids cannot hammer the identity provider.
+If the provider is unreachable, already cached keys keep being served.
+
+Errors are raised as ``jwt.PyJWKClientError`` like PyJWKClient's.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+import jwt
+import requests
+
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 5
+MIN_REFRESH_INTERVAL = 30.0
+
+
+class JwksCache:
+    """Thread-safe cache of one provider's signing keys."""
+
+    def __init__(self, jwks_uri: str, lifespan: float = 3600) -> None:
+        self.jwks_uri = jwks_uri
+        self.lifespan = lifespan
+        self.keys: dict[str, Any] = {}
+        self.etag: str | None = None
+        self.expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = threading.Lock()
+
+    def get_key(self, kid: str | None) -> Any:
+        """Public key object for ``kid``, refreshing the JWKS if needed."""
+        if kid is None:
+            raise jwt.PyJWKClientError("Token header has no 'kid'")
+        now = time.monotonic()
+        if now >= self.expires_at:
+            self.refresh()
+        key = self.keys.get(kid)
+        if key is None and time.monotonic() - self._last_fetch >= MIN_REFRESH_INTERVAL:
+            # Possibly rotated since the last download
+            self.refresh()
+            key = self.keys.get(kid)
+        if key is None:
+            raise jwt.PyJWKClientError(f"Unable to find a signing key that matches: {kid!r}")
+        return key
+
+    def refresh(self, force: bool = False) -> None:
+        """Revalidate the JWKS; concurrent callers share a single request.
+
+        If the JWKS cannot be fetched but keys are already cached, the old
+        keys keep being served and the next attempt is delayed by
+        MIN_REFRESH_INTERVAL. Only raises when there are no keys at all.
+        """
+        started = time.monotonic()
+        with self._lock:
+            if not force and self._last_fetch > started:
+                return  # Another thread refreshed while we waited
+            try:
+                self._fetch()
+            except jwt.PyJWKClientError as e:
+                now = time.monotonic()
+                self._last_fetch = now
+                self.expires_at = now + MIN_REFRESH_INTERVAL
+                if not self.keys:
+                    raise
+                logger.warning("JWKS refresh failed, keeping %d cached key(s): %s", len(self.keys), e)
+
+    def _fetch(self) -> None:
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        try:
+            resp = requests.get(self.jwks_uri, headers=headers, timeout=FETCH_TIMEOUT)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+        except requests.RequestException as e:
+            raise jwt.PyJWKClientConnectionError(f"Failed to fetch JWKS from {self.jwks_uri}: {e}") from e
+        if resp.status_code == 200:
+            try:
+                jwks = resp.json()
+            except ValueError as e:
+                raise jwt.PyJWKClientError(f"Invalid JWKS from {self.jwks_uri}: {e}") from e
+            self.keys = self._parse(jwks)
+            self.etag = resp.headers.get("ETag")
+        now = time.monotonic()
+        self._last_fetch = now
+        self.expires_at = now + self.lifespan
+
+    def _parse(self, jwks: dict) -> dict[str, Any]:
+        keys: dict[str, Any] = {}
+        for jwk in jwks.get("keys", []):
+            if jwk.get("use", "sig") != "sig" or "kid" not in jwk:
+                continue
+            try:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+            except jwt.PyJWKError as e:
+                logger.debug("Skipping unusable JWK %s from %s: %s", jwk.get("kid"), self.jwks_uri, e)
+        if not keys:
+            raise jwt.PyJWKClientError(f"The JWKS endpoint {self.jwks_uri} did not contain any signing keys")
+        return keys
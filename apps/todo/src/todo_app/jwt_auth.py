@@ -8,15 +8,36 @@ Supports multiple OIDC providers (e.g. web + mobile) via OIDC_JWT_ISSUERS.
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from typing import Optional
 
 import jwt
-from jwt import PyJWKClient
+import orjson
+from jwt.utils import base64url_decode
+
+from . import jwt_auth_cache
+from .jwks_cache import JwksCache
 
 logger = logging.getLogger(__name__)
 
-# List of trusted (jwks_client, audience, issuer) tuples
-_trusted_providers: list[tuple[PyJWKClient, str, str]] = []
+JWKS_LIFESPAN = 3600
+
+
+@dataclass(frozen=True, slots=True)
+class _Provider:
+    jwks: JwksCache
+    audience: str
+    issuer: str
+
+
+# Trusted providers, in configuration order
+_trusted_providers: list[_Provider] = []
+# Same providers keyed by issuer, so a token is only verified against its own
+_providers_by_issuer: dict[str, list[_Provider]] = {}
+# Background thread keeping every provider's JWKS warm (one per process)
+_refresher: threading.Thread | None = None
 
 
 def init_jwt_auth(app) -> None:
@@ -25,8 +46,15 @@ def init_jwt_auth(app) -> None:
     Reads the primary OIDC_ISSUER/OIDC_CLIENT_ID, plus any additional
     issuers from OIDC_JWT_ISSUERS (comma-separated "issuer|client_id" pairs).
     """
-    global _trusted_providers
+    global _trusted_providers, _providers_by_issuer
     _trusted_providers = []
+    _providers_by_issuer = {}
+
+    jwt_auth_cache.configure(
+        enabled=app.config.get("JWT_CACHE_ENABLED", True),
+        maxsize=app.config.get("JWT_CACHE_SIZE", 4096),
+        ttl=app.config.get("JWT_CACHE_TTL", 60),
+    )
 
     if not app.config.get("OIDC_ENABLED"):
         logger.info("JWT auth disabled (OIDC not enabled)")
@@ -51,6 +79,8 @@ def init_jwt_auth(app) -> None:
 
     if _trusted_providers:
         logger.info("JWT auth enabled — %d trusted provider(s)", len(_trusted_providers))
+        _refresh_all_jwks()
+        _start_jwks_refresher(JWKS_LIFESPAN / 2)
     else:
         logger.warning("JWT auth disabled: no valid providers configured")
 
@@ -64,37 +94,90 @@ def _add_provider(issuer: str, client_id: str) -> None:
     """
     jwks_uri = f"{issuer.rstrip('/')}/jwks/"
     logger.info("JWT: trusting issuer %s (audience: %s, JWKS: %s)", issuer, client_id, jwks_uri)
-    client = PyJWKClient(jwks_uri, cache_keys=True, lifespan=3600)
-    _trusted_providers.append((client, client_id, issuer))
+    provider = _Provider(JwksCache(jwks_uri, lifespan=JWKS_LIFESPAN), client_id, issuer)
+    _trusted_providers.append(provider)
+    _providers_by_issuer.setdefault(issuer, []).append(provider)
+
+
+def _refresh_all_jwks() -> None:
+    """Fetch every provider's JWKS so requests never wait on the IdP.
+
+    Failures are logged only; the cache retries on the next lookup.
+    """
+    for p in _trusted_providers:
+        try:
+            p.jwks.refresh()
+        except jwt.PyJWKClientError as e:
+            logger.warning("JWKS prefetch failed for %s: %s", p.issuer, e)
+        except Exception as e:
+            logger.error("Unexpected JWKS prefetch error (%s): %s", p.issuer, e)
+
+
+def _start_jwks_refresher(interval: float) -> None:
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            _refresh_all_jwks()
+
+    _refresher = threading.Thread(target=run, name="jwks-refresh", daemon=True)
+    _refresher.start()
 
 
 def validate_bearer_token(token: str) -> Optional[dict]:
     """Validate a JWT bearer token and return user claims.
 
-    Tries each trusted provider until one succeeds.
-    Returns a dict with keys: sub, email, name (matching session format)
+    Only providers whose issuer matches the token's (unverified) ``iss``
+    claim are tried, so a token costs at most one signature check per
+    matching provider rather than one per configured provider.
+    Returns a dict with keys: sub, email, name (matching session format),
+    plus groups and exp,
     or None if validation fails against all providers.
     """
     if not _trusted_providers:
         return None
 
-    for jwks_client, audience, issuer in _trusted_providers:
-        result = _try_validate(token, jwks_client, audience, issuer)
+    token_issuer = _unverified_issuer(token)
+    providers = _providers_by_issuer.get(token_issuer) if token_issuer else None
+    if not providers:
+        logger.debug("JWT from untrusted or missing issuer: %s", token_issuer)
+        return None
+
+    for p in providers:
+        result = _try_validate(token, p.jwks, p.audience, p.issuer)
         if result is not None:
             return result
 
-    logger.debug("JWT rejected by all %d providers", len(_trusted_providers))
+    logger.debug("JWT rejected by all %d providers for %s", len(providers), token_issuer)
     return None
 
 
-def _try_validate(token: str, jwks_client: PyJWKClient, audience: str, issuer: str) -> Optional[dict]:
+def _unverified_issuer(token: str) -> Optional[str]:
+    """Read the ``iss`` claim without verifying the token.
+
+    Only used to pick a provider; the claim is verified again by jwt.decode.
+    """
+    try:
+        payload = orjson.loads(base64url_decode(token.split(".", 2)[1]))
+    except (IndexError, ValueError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    iss = payload.get("iss")
+    return iss if isinstance(iss, str) else None
+
+
+def _try_validate(token: str, jwks: JwksCache, audience: str, issuer: str) -> Optional[dict]:
     """Try to validate a token against a single provider."""
     try:
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        signing_key = jwks.get_key(jwt.get_unverified_header(token).get("kid"))
 
         payload = jwt.decode(
             token,
-            signing_key.key,
+            signing_key,
             algorithms=["RS256", "ES256"],
             audience=audience,
             issuer=issuer,
@@ -111,6 +194,7 @@ def _try_validate(token: str, jwks_client: PyJWKClient, audience: str, issuer: s
             "email": payload.get("email"),
             "name": payload.get("name") or payload.get("preferred_username"),
             "groups": payload.get("groups", []),
+            "exp": payload.get("exp"),
         }
 
         if not user_info["sub"]:
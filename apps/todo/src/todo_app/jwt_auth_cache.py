@@ -0,0 +1,81 @@
+"""Short-lived cache of validated bearer tokens.
+
+Mobile clients reuse one access token for many requests, and each
+validation is a full RS256/ES256 signature check. Successful results are
+cached for up to a minute (never past the token's ``exp``), keyed by the
+SHA-256 of the token so raw tokens are not kept in memory. Failures are
+never cached.
+
+On by default; any JWT_CACHE_ENABLED value other than "1" disables it.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class TokenCache:
+    """Thread-safe TTL + LRU map from token hash to user claims."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, claims = entry
+            if expires <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        ttl = self.ttl
+        exp = claims.get("exp")
+        if exp is not None:
+            # Never serve a token past its own expiry
+            ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Set by configure(); None means caching is disabled
+_cache: TokenCache | None = None
+
+
+def configure(enabled: bool, maxsize: int = 4096, ttl: float = 60.0) -> None:
+    """Enable (or disable) the process-wide token cache."""
+    global _cache
+    _cache = TokenCache(maxsize=maxsize, ttl=ttl) if enabled and maxsize > 0 and ttl > 0 else None
+
+
+def get_cache() -> TokenCache | None:
+    return _cache
@@ -2,24 +2,70 @@
 from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Optional
-import uuid
 
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, JSON
+import orjson
+from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from .storage import new_uuid
+
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def new_uuid() -> str:
-    return str(uuid.uuid4())
+# orjson encodes datetimes in C; naive values (SQLite) are UTC, as in _format_ts
+ORJSON_OPTS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_OMIT_MICROSECONDS
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def _format_ts(value: datetime | None) -> str | None:
+    """``YYYY-MM-DDTHH:MM:SSZ`` in UTC; naive values are taken to be UTC already."""
+    if not value:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    # isoformat() skips strftime's locale-aware formatting
+    return value.isoformat(timespec="seconds") + "Z"
+
+
+def _loaded_state(obj, columns: tuple[str, ...]) -> dict:
+    """The instance ``__dict__``, for reading columns without instrumented attribute access.
+
+    Columns that are expired or deferred are loaded first through normal attribute access.
+    """
+    state = obj.__dict__
+    for name in columns:
+        if name not in state:
+            getattr(obj, name)
+    return state
+
+
+class _JsonListMixin:
+    """Serialize many rows at once, in the same shape as ``to_dict()``.
+
+    Timestamps are left as datetimes for orjson to encode, so they must be
+    naive UTC or UTC-aware (what SQLite and a UTC Postgres session return).
+    """
+
+    _COLUMNS: tuple[str, ...] = ()
+
+    @classmethod
+    def dump_list(cls, rows) -> bytes:
+        columns = cls._COLUMNS
+        items = []
+        for row in rows:
+            d = _loaded_state(row, columns)
+            item = {name: d[name] for name in columns}
+            if "tags" in item and item["tags"] is None:
+                item["tags"] = {}
+            items.append(item)
+        return orjson.dumps(items, option=ORJSON_OPTS)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -35,11 +81,13 @@ class User(Base):
     work_items: Mapped[list["WorkItem"]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
 
-class Todo(Base):
+class Todo(_JsonListMixin, Base):
     __tablename__ = "todos"
+    # Tenant-scoped lookups filter on (user_id, id); the leading user_id also serves list queries
+    __table_args__ = (Index("ix_todos_user_id_id", "user_id", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_uuid)
-    user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     tags: Mapped[dict] = mapped_column(JSON, default=dict)
@@ -50,24 +98,29 @@ class Todo(Base):
 
     user: Mapped["User"] = relationship(back_populates="todos")
 
+    _COLUMNS = ("id", "title", "description", "tags", "done", "due_date", "created_at", "updated_at")
+
     def to_dict(self) -> dict:
+        d = _loaded_state(self, self._COLUMNS)
         return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "tags": self.tags or {},
-            "done": self.done,
-            "due_date": self.due_date,
-            "created_at": self.created_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.created_at else None,
-            "updated_at": self.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.updated_at else None,
+            "id": d["id"],
+            "title": d["title"],
+            "description": d["description"],
+            "tags": d["tags"] or {},
+            "done": d["done"],
+            "due_date": d["due_date"],
+            "created_at": _format_ts(d["created_at"]),
+            "updated_at": _format_ts(d["updated_at"]),
         }
 
 
-class Note(Base):
+class Note(_JsonListMixin, Base):
     __tablename__ = "notes"
+    # Tenant-scoped lookups filter on (user_id, id); the leading user_id also serves list queries
+    __table_args__ = (Index("ix_notes_user_id_id", "user_id", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_uuid)
-    user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     note: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     tags: Mapped[dict] = mapped_column(JSON, default=dict)
@@ -76,22 +129,27 @@ class Note(Base):
 
     user: Mapped["User"] = relationship(back_populates="notes")
 
+    _COLUMNS = ("id", "title", "note", "tags", "created_at", "updated_at")
+
     def to_dict(self) -> dict:
+        d = _loaded_state(self, self._COLUMNS)
         return {
-            "id": self.id,
-            "title": self.title,
-            "note": self.note,
-            "tags": self.tags or {},
-            "created_at": self.created_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.created_at else None,
-            "updated_at": self.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.updated_at else None,
+            "id": d["id"],
+            "title": d["title"],
+            "note": d["note"],
+            "tags": d["tags"] or {},
+            "created_at": _format_ts(d["created_at"]),
+            "updated_at": _format_ts(d["updated_at"]),
         }
 
 
-class WorkItem(Base):
+class WorkItem(_JsonListMixin, Base):
     __tablename__ = "work_items"
+    # Tenant-scoped lookups filter on (user_id, id); the leading user_id also serves list queries
+    __table_args__ = (Index("ix_work_items_user_id_id", "user_id", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_uuid)
-    user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id"), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(String(255), ForeignKey("users.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(500), nullable=False)
     start_date: Mapped[str] = mapped_column(String(32), nullable=False)
     end_date: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
@@ -102,14 +160,17 @@ class WorkItem(Base):
 
     user: Mapped["User"] = relationship(back_populates="work_items")
 
+    _COLUMNS = ("id", "name", "start_date", "end_date", "description", "why", "created_at", "updated_at")
+
     def to_dict(self) -> dict:
+        d = _loaded_state(self, self._COLUMNS)
         return {
-            "id": self.id,
-            "name": self.name,
-            "start_date": self.start_date,
-            "end_date": self.end_date,
-            "description": self.description,
-            "why": self.why,
-            "created_at": self.created_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.created_at else None,
-            "updated_at": self.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ") if self.updated_at else None,
+            "id": d["id"],
+            "name": d["name"],
+            "start_date": d["start_date"],
+            "end_date": d["end_date"],
+            "description": d["description"],
+            "why": d["why"],
+            "created_at": _format_ts(d["created_at"]),
+            "updated_at": _format_ts(d["updated_at"]),
         }
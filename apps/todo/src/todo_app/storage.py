@@ -1,16 +1,33 @@
 from __future__ import annotations
+import atexit
 import json
 import os
+import re
 import shutil
 import tempfile
-import uuid
+import time
+import weakref
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone, date
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
+
 ISO_DT = "%Y-%m-%dT%H:%M:%SZ"
+# Leading YYYY-MM-DD of a date or ISO datetime string
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+
+PRIORITIES = frozenset({"low", "medium", "high", "urgent"})
+
+# O_DSYNC makes each WAL write durable without a separate fsync (not on Windows)
+_HAVE_DSYNC = hasattr(os, "O_DSYNC")
+_WAL_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_DSYNC if _HAVE_DSYNC else 0)
+
+# Set by the store; ignored in update bodies
+_READONLY_FIELDS = frozenset({"id", "created_at", "updated_at"})
 
-PRIORITIES = {"low", "medium", "high", "urgent"}
+# WAL entry type prefix -> state collection
+_WAL_KINDS = {"todo": "todos", "note": "notes", "work": "work_items"}
 
 
 @dataclass
@@ -51,38 +68,89 @@ class ValidationError(Exception):
     pass
 
 
+def parse_iso_date(value: str) -> Optional[date]:
+    """Parse the leading YYYY-MM-DD of ``value``; None if it isn't a valid date."""
+    m = _DATE_RE.match(value)
+    if m is None:
+        return None
+    try:
+        return date(int(m[1]), int(m[2]), int(m[3]))
+    except ValueError:  # e.g. month 13
+        return None
+
+
+def validate_tags(tags: Dict[str, str]) -> None:
+    """Check the tag dict shared by todos and notes (both storage backends)."""
+    if not isinstance(tags, dict):
+        raise ValidationError("tags must be a dict")
+    category = tags.get("category")
+    if type(category) is not str or not category.strip():
+        raise ValidationError("missing required tag: category")
+    priority = tags.get("priority")
+    # A valid priority is necessarily a non-empty string, so check that first
+    if type(priority) is not str or priority not in PRIORITIES:
+        if type(priority) is not str or not priority.strip():
+            raise ValidationError("missing required tag: priority")
+        raise ValidationError("priority must be one of: low, medium, high, urgent")
+    # JSON only produces exact str keys/values; type() skips isinstance's MRO walk
+    for k, v in tags.items():
+        if type(k) is not str or type(v) is not str:
+            raise ValidationError("tags must be a str->str dict")
+
+
+def new_uuid() -> str:
+    """Random version-4 UUID string, without building a ``uuid.UUID``."""
+    b = bytearray(os.urandom(16))
+    b[6] = b[6] & 0x0F | 0x40  # version 4
+    b[8] = b[8] & 0x3F | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).strftime(ISO_DT)
 
 
+def _compact_at_exit(ref: weakref.ref) -> None:
+    store = ref()
+    if store is not None and store._dirty_ops:
+        try:
+            store.compact()
+        except OSError:
+            pass
+
+
 class JsonStore:
+    # With a WAL, mutations only append to it; the full snapshot is
+    # rewritten (and the WAL truncated) after this many writes or seconds
+    COMPACT_EVERY_OPS = 500
+    COMPACT_INTERVAL = 60.0
+
     def __init__(self, data_file: str, backups: int = 10, wal_file: str | None = None):
         self.data_file = data_file
         self.backups = int(backups)
         self.wal_file = wal_file
         self.state = {"todos": [], "notes": [], "work_items": []}
+        # id -> list position for each collection in state; see _reindex()
+        self._index: Dict[str, Dict[str, int]] = {kind: {} for kind in self.state}
+        self._dirty_ops = 0
+        self._last_compact = time.monotonic()
+        # Kept open between appends; see _append_wal()
+        self._wal_fd: int | None = None
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        atexit.register(_compact_at_exit, weakref.ref(self))
 
     # ---------- Validation ----------
     def _validate_tags(self, tags: Dict[str, str]):
-        if not isinstance(tags, dict):
-            raise ValidationError("tags must be a dict")
-        required = ["category", "priority"]
-        for r in required:
-            if r not in tags or not isinstance(tags[r], str) or not tags[r].strip():
-                raise ValidationError(f"missing required tag: {r}")
-        if tags.get("priority") not in PRIORITIES:
-            raise ValidationError("priority must be one of: low, medium, high, urgent")
-        for k, v in tags.items():
-            if not isinstance(k, str) or not isinstance(v, str):
-                raise ValidationError("tags must be a str->str dict")
+        validate_tags(tags)
 
     def _validate_todo(self, data: Dict[str, Any], for_update: bool = False):
+        """Validate a new todo, or just the fields present in an update."""
         if not for_update:
             if not data.get("title"):
                 raise ValidationError("title is required")
-        tags = data.get("tags", {})
-        self._validate_tags(tags)
+        if not for_update or "tags" in data:
+            self._validate_tags(data.get("tags", {}))
         if data.get("due_date"):
             # allow YYYY-MM-DD or ISO datetime
             dd = data["due_date"]
@@ -90,11 +158,12 @@ class JsonStore:
                 raise ValidationError("due_date must be string in YYYY-MM-DD or ISO format")
 
     def _validate_note(self, data: Dict[str, Any], for_update: bool = False):
+        """Validate a new note, or just the fields present in an update."""
         if not for_update:
             if not data.get("title"):
                 raise ValidationError("title is required")
-        tags = data.get("tags", {})
-        self._validate_tags(tags)
+        if not for_update or "tags" in data:
+            self._validate_tags(data.get("tags", {}))
 
     def _validate_work(self, data: Dict[str, Any], for_update: bool = False):
         name = (data.get("name") or "").strip()
@@ -103,28 +172,26 @@ class JsonStore:
         sd = data.get("start_date")
         if not isinstance(sd, str) or not sd:
             raise ValidationError("start_date is required (YYYY-MM-DD)")
-        try:
-            sdate = date.fromisoformat(sd[:10])
-        except Exception:
+        sdate = parse_iso_date(sd)
+        if sdate is None:
             raise ValidationError("start_date must be YYYY-MM-DD")
         ed = data.get("end_date")
         if ed:
             if not isinstance(ed, str):
                 raise ValidationError("end_date must be string YYYY-MM-DD")
-            try:
-                edate = date.fromisoformat(ed[:10])
-            except Exception:
+            edate = parse_iso_date(ed)
+            if edate is None:
                 raise ValidationError("end_date must be YYYY-MM-DD")
             if edate < sdate:
                 raise ValidationError("end_date cannot be earlier than start_date")
 
     # ---------- Persistence ----------
-    def _atomic_write(self, path: str, content: str):
+    def _atomic_write(self, path: str, content: bytes):
         d = os.path.dirname(path)
         os.makedirs(d, exist_ok=True)
         fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp_", suffix=".json")
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
+            with os.fdopen(fd, "wb") as f:
                 f.write(content)
                 f.flush()
                 os.fsync(f.fileno())
@@ -146,31 +213,96 @@ class JsonStore:
                 else:
                     os.replace(src, dst)
         if os.path.exists(self.data_file):
-            shutil.copy2(self.data_file, f"{self.data_file}.bak.1")
+            bak = f"{self.data_file}.bak.1"
+            if os.path.lexists(bak):
+                os.remove(bak)
+            try:
+                # _atomic_write replaces data_file with a new inode, so the
+                # link keeps the old contents without copying them
+                os.link(self.data_file, bak)
+            except OSError:
+                # Filesystems without hard links
+                shutil.copy2(self.data_file, bak)
 
     def _append_wal(self, entry: Dict[str, Any]):
         if not self.wal_file:
             return
-        os.makedirs(os.path.dirname(self.wal_file), exist_ok=True)
-        with open(self.wal_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        if self._wal_fd is None:
+            os.makedirs(os.path.dirname(self.wal_file), exist_ok=True)
+            self._wal_fd = os.open(self.wal_file, _WAL_OPEN_FLAGS, 0o644)
+        data = memoryview(orjson.dumps(entry) + b"\n")
+        while data:
+            data = data[os.write(self._wal_fd, data):]
+        if not _HAVE_DSYNC:
+            os.fsync(self._wal_fd)
+
+    def close(self):
+        """Close the WAL descriptor; the next append reopens it."""
+        if self._wal_fd is not None:
+            os.close(self._wal_fd)
+            self._wal_fd = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except (AttributeError, OSError):
+            pass
 
     def _flush(self):
-        content = json.dumps(self.state, ensure_ascii=False, indent=2)
+        content = orjson.dumps(self.state, option=orjson.OPT_NON_STR_KEYS)
         self._atomic_write(self.data_file, content)
 
+    def _commit(self, entry: Dict[str, Any]):
+        """Persist one mutation: append it to the WAL, compacting now and then.
+
+        Without a WAL every mutation rewrites the snapshot.
+        """
+        if not self.wal_file:
+            self._flush()
+            return
+        self._append_wal(entry)
+        self._dirty_ops += 1
+        if self._dirty_ops >= self.COMPACT_EVERY_OPS or time.monotonic() - self._last_compact >= self.COMPACT_INTERVAL:
+            self.compact()
+
+    def compact(self):
+        """Write a full snapshot and truncate the WAL it now covers."""
+        self._flush()
+        if self._wal_fd is not None:
+            # O_APPEND writes continue at the new end of file
+            os.ftruncate(self._wal_fd, 0)
+            os.fsync(self._wal_fd)
+        elif self.wal_file and os.path.exists(self.wal_file):
+            with open(self.wal_file, "wb") as f:
+                os.fsync(f.fileno())
+        self._dirty_ops = 0
+        self._last_compact = time.monotonic()
+
+    @staticmethod
+    def _read_json(path: str) -> Any:
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Files written by older versions may hold values orjson rejects (e.g. NaN)
+            return json.loads(raw)
+
     def load_or_recover(self):
         # Try load
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, "r", encoding="utf-8") as f:
-                    self.state = json.load(f)
+                self.state = self._read_json(self.data_file)
                 # basic validation
                 if not isinstance(self.state, dict) or "todos" not in self.state or "notes" not in self.state:
                     raise ValueError("invalid structure")
                 # compatibility: ensure work_items exists
                 if "work_items" not in self.state:
                     self.state["work_items"] = []
+                self._reindex()
+                # Mutations since the last compaction live only in the WAL
+                if self._replay_wal():
+                    self.compact()
                 return
         except Exception:
             pass
@@ -179,73 +311,117 @@ class JsonStore:
             bak = f"{self.data_file}.bak.{i}"
             try:
                 if os.path.exists(bak):
-                    with open(bak, "r", encoding="utf-8") as f:
-                        self.state = json.load(f)
+                    self.state = self._read_json(bak)
                     if isinstance(self.state, dict) and "todos" in self.state and "notes" in self.state:
                         if "work_items" not in self.state:
                             self.state["work_items"] = []
                         # After restoring from backup, try replay WAL
+                        self._reindex()
                         self._replay_wal()
-                        self._flush()
+                        self.compact()
                         return
             except Exception:
                 continue
         # If no backups, start clean and try replay WAL
         self.state = {"todos": [], "notes": [], "work_items": []}
+        self._reindex()
         self._replay_wal()
-        self._flush()
+        self.compact()
 
-    def _replay_wal(self):
+    def _replay_wal(self) -> int:
+        """Apply WAL entries on top of the loaded state; returns how many applied.
+
+        Expects the id index to be current. Deletes leave a None tombstone
+        that is swept once at the end, so each entry is O(1).
+        """
+        applied = 0
         if not self.wal_file or not os.path.exists(self.wal_file):
-            return
+            return applied
         try:
-            with open(self.wal_file, "r", encoding="utf-8") as f:
+            with open(self.wal_file, "rb") as f:
                 for line in f:
                     try:
-                        entry = json.loads(line)
+                        entry = orjson.loads(line)
                         self._apply_wal_entry(entry)
+                        applied += 1
                     except Exception:
                         continue
         except Exception:
             pass
+        swept = False
+        for kind in _WAL_KINDS.values():
+            if None in self.state[kind]:
+                self.state[kind] = [it for it in self.state[kind] if it is not None]
+                swept = True
+        if swept:
+            self._reindex()
+        return applied
 
     def _apply_wal_entry(self, e: Dict[str, Any]):
-        t = e.get("type")
-        if t == "todo_create":
-            self.state["todos"].append(e["data"]) 
-        elif t == "todo_update":
-            for i, it in enumerate(self.state["todos"]):
-                if it["id"] == e["id"]:
-                    self.state["todos"][i] = e["data"]
-        elif t == "todo_delete":
-            self.state["todos"] = [it for it in self.state["todos"] if it["id"] != e["id"]]
-        elif t == "note_create":
-            self.state["notes"].append(e["data"]) 
-        elif t == "note_update":
-            for i, it in enumerate(self.state["notes"]):
-                if it["id"] == e["id"]:
-                    self.state["notes"][i] = e["data"]
-        elif t == "note_delete":
-            self.state["notes"] = [it for it in self.state["notes"] if it["id"] != e["id"]]
-        elif t == "work_create":
-            self.state["work_items"].append(e["data"])
-        elif t == "work_update":
-            for i, it in enumerate(self.state["work_items"]):
-                if it["id"] == e["id"]:
-                    self.state["work_items"][i] = e["data"]
-        elif t == "work_delete":
-            self.state["work_items"] = [it for it in self.state["work_items"] if it["id"] != e["id"]]
+        # Idempotent, since entries may already be in the snapshot if a
+        # compaction was interrupted before the WAL was truncated
+        prefix, _, op = e.get("type", "").partition("_")
+        kind = _WAL_KINDS.get(prefix)
+        if kind is None:
+            return
+        if op in ("create", "update"):
+            item = e["data"]
+            if op == "update" and item.get("id") != e["id"]:
+                # Older WAL files may hold an id from the request body; the
+                # entry id is the item that was updated
+                item = {**item, "id": e["id"]}
+            idx = self._index[kind].get(item["id"])
+            if idx is None:
+                self._append(kind, item)
+            else:
+                self.state[kind][idx] = item
+        elif op == "delete":
+            idx = self._index[kind].pop(e["id"], None)
+            if idx is not None:
+                self.state[kind][idx] = None
 
     def validate_store(self) -> Tuple[bool, str]:
         try:
-            json.dumps(self.state)
+            orjson.dumps(self.state, option=orjson.OPT_NON_STR_KEYS)
             return True, "ok"
         except Exception as e:
             return False, str(e)
 
     # ---------- CRUD Helpers ----------
     def _new_id(self) -> str:
-        return str(uuid.uuid4())
+        return new_uuid()
+
+    @staticmethod
+    def _updates(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields a client may change: non-null values, minus id and timestamps."""
+        return {k: v for k, v in data.items() if v is not None and k not in _READONLY_FIELDS}
+
+    def _reindex(self):
+        self._index = {}
+        for kind in ("todos", "notes", "work_items"):
+            items = self.state[kind]
+            # Walk backwards so the first item wins if an id is duplicated
+            self._index[kind] = {items[i]["id"]: i for i in range(len(items) - 1, -1, -1)}
+
+    def _get(self, kind: str, item_id: str) -> Optional[Dict[str, Any]]:
+        idx = self._index[kind].get(item_id)
+        return self.state[kind][idx] if idx is not None else None
+
+    def _append(self, kind: str, item: Dict[str, Any]):
+        self._index[kind].setdefault(item["id"], len(self.state[kind]))
+        self.state[kind].append(item)
+
+    def _remove(self, kind: str, item_id: str) -> bool:
+        index = self._index[kind]
+        idx = index.pop(item_id, None)
+        if idx is None:
+            return False
+        items = self.state[kind]
+        del items[idx]
+        # Only positions after the removed item shift
+        for i in range(len(items) - 1, idx - 1, -1):
+            index[items[i]["id"]] = i
+        return True
 
     # Todos
     # Note: user_id parameter is accepted but ignored in single-user JSON mode
@@ -254,7 +430,7 @@ class JsonStore:
         return list(self.state["todos"])  # shallow copy
 
     def get_todo(self, tid: str, user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        return next((t for t in self.state["todos"] if t["id"] == tid), None)
+        return self._get("todos", tid)
 
     def create_todo(self, data: Dict[str, Any], user_id: str | None = None) -> Dict[str, Any]:
         self._validate_todo(data)
@@ -269,34 +445,26 @@ class JsonStore:
             "created_at": now,
             "updated_at": now,
         }
-        self.state["todos"].append(item)
-        self._append_wal({"type": "todo_create", "data": item})
-        self._flush()
+        self._append("todos", item)
+        self._commit({"type": "todo_create", "data": item})
         return item
 
     def update_todo(self, tid: str, data: Dict[str, Any], user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        idx = next((i for i, t in enumerate(self.state["todos"]) if t["id"] == tid), None)
+        idx = self._index["todos"].get(tid)
         if idx is None:
             return None
-        current = self.state["todos"][idx]
-        merged = {
-            **current,
-            **{k: v for k, v in data.items() if v is not None},
-            "updated_at": now_iso(),
-        }
-        self._validate_todo(merged, for_update=True)
+        # Stored fields were validated on write, so only the incoming ones need checking
+        updates = self._updates(data)
+        self._validate_todo(updates, for_update=True)
+        merged = {**self.state["todos"][idx], **updates, "updated_at": now_iso()}
         self.state["todos"][idx] = merged
-        self._append_wal({"type": "todo_update", "id": tid, "data": merged})
-        self._flush()
+        self._commit({"type": "todo_update", "id": tid, "data": merged})
         return merged
 
     def delete_todo(self, tid: str, user_id: str | None = None) -> bool:
-        before = len(self.state["todos"])
-        self.state["todos"] = [t for t in self.state["todos"] if t["id"] != tid]
-        deleted = len(self.state["todos"]) < before
+        deleted = self._remove("todos", tid)
         if deleted:
-            self._append_wal({"type": "todo_delete", "id": tid})
-            self._flush()
+            self._commit({"type": "todo_delete", "id": tid})
         return deleted
 
     # Notes
@@ -304,7 +472,7 @@ class JsonStore:
         return list(self.state["notes"])  
 
     def get_note(self, nid: str, user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        return next((n for n in self.state["notes"] if n["id"] == nid), None)
+        return self._get("notes", nid)
 
     def create_note(self, data: Dict[str, Any], user_id: str | None = None) -> Dict[str, Any]:
         self._validate_note(data)
@@ -317,41 +485,33 @@ class JsonStore:
             "created_at": now,
             "updated_at": now,
         }
-        self.state["notes"].append(item)
-        self._append_wal({"type": "note_create", "data": item})
-        self._flush()
+        self._append("notes", item)
+        self._commit({"type": "note_create", "data": item})
         return item
 
     def update_note(self, nid: str, data: Dict[str, Any], user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        idx = next((i for i, n in enumerate(self.state["notes"]) if n["id"] == nid), None)
+        idx = self._index["notes"].get(nid)
         if idx is None:
             return None
-        current = self.state["notes"][idx]
-        merged = {
-            **current,
-            **{k: v for k, v in data.items() if v is not None},
-            "updated_at": now_iso(),
-        }
-        self._validate_note(merged, for_update=True)
+        # Stored fields were validated on write, so only the incoming ones need checking
+        updates = self._updates(data)
+        self._validate_note(updates, for_update=True)
+        merged = {**self.state["notes"][idx], **updates, "updated_at": now_iso()}
         self.state["notes"][idx] = merged
-        self._append_wal({"type": "note_update", "id": nid, "data": merged})
-        self._flush()
+        self._commit({"type": "note_update", "id": nid, "data": merged})
         return merged
 
     def delete_note(self, nid: str, user_id: str | None = None) -> bool:
-        before = len(self.state["notes"])
-        self.state["notes"] = [n for n in self.state["notes"] if n["id"] != nid]
-        deleted = len(self.state["notes"]) < before
+        deleted = self._remove("notes", nid)
         if deleted:
-            self._append_wal({"type": "note_delete", "id": nid})
-            self._flush()
+            self._commit({"type": "note_delete", "id": nid})
         return deleted
     # Work Items
     def list_work(self, user_id: str | None = None) -> List[Dict[str, Any]]:
         return list(self.state["work_items"])  # shallow copy
 
     def get_work(self, wid: str, user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        return next((w for w in self.state["work_items"] if w["id"] == wid), None)
+        return self._get("work_items", wid)
 
     def create_work(self, data: Dict[str, Any], user_id: str | None = None) -> Dict[str, Any]:
         self._validate_work(data)
@@ -366,32 +526,27 @@ class JsonStore:
             "created_at": now,
             "updated_at": now,
         }
-        self.state["work_items"].append(item)
-        self._append_wal({"type": "work_create", "data": item})
-        self._flush()
+        self._append("work_items", item)
+        self._commit({"type": "work_create", "data": item})
         return item
 
     def update_work(self, wid: str, data: Dict[str, Any], user_id: str | None = None) -> Optional[Dict[str, Any]]:
-        idx = next((i for i, w in enumerate(self.state["work_items"]) if w["id"] == wid), None)
+        idx = self._index["work_items"].get(wid)
         if idx is None:
             return None
         current = self.state["work_items"][idx]
         merged = {
             **current,
-            **{k: v for k, v in data.items() if v is not None},
+            **self._updates(data),
             "updated_at": now_iso(),
         }
         self._validate_work(merged, for_update=True)
         self.state["work_items"][idx] = merged
-        self._append_wal({"type": "work_update", "id": wid, "data": merged})
-        self._flush()
+        self._commit({"type": "work_update", "id": wid, "data": merged})
         return merged
 
     def delete_work(self, wid: str, user_id: str | None = None) -> bool:
-        before = len(self.state["work_items"])
-        self.state["work_items"] = [w for w in self.state["work_items"] if w["id"] != wid]
-        deleted = len(self.state["work_items"]) < before
+        deleted = self._remove("work_items", wid)
         if deleted:
-            self._append_wal({"type": "work_delete", "id": wid})
-            self._flush()
+            self._commit({"type": "work_delete", "id": wid})
         return deleted
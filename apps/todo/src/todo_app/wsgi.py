@@ -1,4 +1,22 @@
 from . import create_app
 
+
+def _patch_psycopg_for_gevent() -> None:
+    """Let psycopg2 yield to other greenlets while waiting on the DB.
+
+    Only applies under a gevent worker (gunicorn -k gevent) with the
+    ``gevent`` extra installed; a no-op otherwise.
+    """
+    try:
+        from gevent import monkey
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        return
+    if monkey.is_module_patched("socket"):
+        patch_psycopg()
+
+
+_patch_psycopg_for_gevent()
+
 # WSGI entrypoint for production servers (e.g., gunicorn)
 app = create_app()
@@ -76,6 +76,25 @@ def test_validation(client):
     assert resp.status_code == 400
 
 
+def test_json_bodies_without_content_type(client):
+    # Bodies are parsed regardless of Content-Type; garbage counts as empty
+    resp = client.post("/api/todos", data=json.dumps({
+        "title": "Raw",
+        "tags": {"category": "work", "priority": "low"},
+    }))
+    assert resp.status_code == 201
+    assert resp.mimetype == "application/json"
+
+    resp = client.post("/api/todos", data="{ broken json")
+    assert resp.status_code == 400
+
+    resp = client.post("/api/todos", data="[1, 2]")
+    assert resp.status_code == 400
+
+    resp = client.get("/api/todos")
+    assert [t["title"] for t in resp.get_json()] == ["Raw"]
+
+
 def test_backups_and_wal_recovery(tmp_path):
     data_file = tmp_path / "appdata.json"
     wal_file = tmp_path / "appdata.wal"
@@ -99,3 +118,61 @@ def test_backups_and_wal_recovery(tmp_path):
         # Should recover from WAL or backup
         todos = s2.list_todos()
         assert any(t["id"] == tid for t in todos)
+
+
+def test_wal_only_writes_and_compaction(tmp_path):
+    from todo_app.storage import JsonStore
+
+    data_file = tmp_path / "appdata.json"
+    wal_file = tmp_path / "appdata.wal"
+    s = JsonStore(str(data_file), wal_file=str(wal_file))
+    s.load_or_recover()
+    snapshot = data_file.read_bytes()
+
+    tags = {"category": "work", "priority": "low"}
+    keep = s.create_todo({"title": "keep", "tags": tags})
+    gone = s.create_todo({"title": "gone", "tags": tags})
+    s.update_todo(keep["id"], {"title": "kept"})
+    s.delete_todo(gone["id"])
+    # Mutations only went to the WAL
+    assert data_file.read_bytes() == snapshot
+
+    # Simulate a compaction interrupted before the WAL was truncated
+    wal = wal_file.read_bytes()
+    s.compact()
+    assert wal_file.read_bytes() == b""
+    wal_file.write_bytes(wal)
+
+    s2 = JsonStore(str(data_file), wal_file=str(wal_file))
+    s2.load_or_recover()
+    assert [t["title"] for t in s2.list_todos()] == ["kept"]
+    assert wal_file.read_bytes() == b""
+
+
+def test_update_ignores_id_and_timestamps(client):
+    r = client.post("/api/todos", json={"title": "x", "tags": {"category": "work", "priority": "low"}})
+    todo = r.get_json()
+    r = client.put(f"/api/todos/{todo['id']}", json={"id": "other", "title": "y", "created_at": "2000-01-01T00:00:00Z"})
+    updated = r.get_json()
+    assert updated["id"] == todo["id"]
+    assert updated["created_at"] == todo["created_at"]
+    assert client.get(f"/api/todos/{todo['id']}").get_json()["title"] == "y"
+    assert client.get("/api/todos/other").status_code == 404
+
+
+def test_wal_update_replayed_by_entry_id(tmp_path):
+    from todo_app.storage import JsonStore
+
+    data_file = tmp_path / "appdata.json"
+    wal_file = tmp_path / "appdata.wal"
+    s = JsonStore(str(data_file), wal_file=str(wal_file))
+    s.load_or_recover()
+    todo = s.create_todo({"title": "x", "tags": {"category": "work", "priority": "low"}})
+    s.compact()
+    # An update entry whose data carries a different id (older WAL files)
+    s._append_wal({"type": "todo_update", "id": todo["id"], "data": {**todo, "id": "other", "title": "y"}})
+
+    s2 = JsonStore(str(data_file), wal_file=str(wal_file))
+    s2.load_or_recover()
+    assert [(t["id"], t["title"]) for t in s2.list_todos()] == [(todo["id"], "y")]
+    assert s2.get_todo(todo["id"])["title"] == "y"
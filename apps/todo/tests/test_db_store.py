@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import event
+from todo_app.db_store import PostgresStore
+from todo_app.storage import ValidationError
+
+TAGS = {"category": "work", "priority": "low"}
+
+
+@pytest.fixture()
+def store(tmp_path):
+    # File-backed SQLite: the pool arguments PostgresStore passes don't apply to :memory:
+    s = PostgresStore(f"sqlite:///{tmp_path / 'todo.db'}")
+    s.init_db()
+    yield s
+    s.engine.dispose()
+
+
+@pytest.fixture()
+def statements(store):
+    seen = []
+    event.listen(store.engine, "before_cursor_execute", lambda conn, cursor, stmt, *args: seen.append(stmt.split()[0]))
+    return seen
+
+
+def test_create_and_partial_update(store):
+    todo = store.create_todo({"title": "t", "tags": TAGS, "due_date": "2030-01-01"}, "u1")
+    assert store.get_todo(todo["id"], "u1") == todo
+
+    updated = store.update_todo(todo["id"], {"done": True}, "u1")
+    assert updated["done"] is True
+    assert updated["title"] == "t" and updated["tags"] == TAGS and updated["due_date"] == "2030-01-01"
+    assert store.get_todo(todo["id"], "u1") == updated
+    with pytest.raises(ValidationError):
+        store.update_todo(todo["id"], {"tags": {"category": "work"}}, "u1")
+
+    note = store.create_note({"title": "n", "tags": TAGS}, "u1")
+    updated = store.update_note(note["id"], {"note": "body"}, "u1")
+    assert (updated["title"], updated["note"], updated["tags"]) == ("n", "body", TAGS)
+
+
+def test_update_work_merges_stored_row(store):
+    work = store.create_work({"name": "w", "start_date": "2030-01-02", "why": "a"}, "u1")
+
+    updated = store.update_work(work["id"], {"description": "d"}, "u1")
+    assert (updated["name"], updated["start_date"], updated["why"], updated["description"]) == ("w", "2030-01-02", "a", "d")
+
+    # end_date is checked against the stored start_date
+    with pytest.raises(ValidationError):
+        store.update_work(work["id"], {"end_date": "2030-01-01"}, "u1")
+
+    updated = store.update_work(work["id"], {"start_date": "2029-12-01", "end_date": "2030-01-01"}, "u1")
+    assert (updated["start_date"], updated["end_date"]) == ("2029-12-01", "2030-01-01")
+
+
+def test_missing_or_foreign_items_return_none(store):
+    todo = store.create_todo({"title": "t", "tags": TAGS}, "u1")
+    note = store.create_note({"title": "n", "tags": TAGS}, "u1")
+    work = store.create_work({"name": "w", "start_date": "2030-01-01"}, "u1")
+
+    assert store.update_todo("missing", {"done": True}, "u1") is None
+    assert store.update_note("missing", {"note": "x"}, "u1") is None
+    assert store.update_work("missing", {"why": "x"}, "u1") is None
+    # Other users' rows are invisible
+    assert store.update_todo(todo["id"], {"done": True}, "u2") is None
+    assert store.update_note(note["id"], {"note": "x"}, "u2") is None
+    assert store.update_work(work["id"], {"why": "x"}, "u2") is None
+    assert store.get_todo(todo["id"], "u2") is None
+    assert store.get_todo(todo["id"], "u1")["done"] is False
+
+
+def test_known_users_skip_the_database(store, statements):
+    user = store.get_or_create_user("u1", email="u1@example.com", name="U1")
+    assert (user.id, user.email, user.name) == ("u1", "u1@example.com", "U1")
+
+    statements.clear()
+    again = store.get_or_create_user("u1", email="u1@example.com")
+    assert (again.id, again.email, again.name) == ("u1", "u1@example.com", "U1")
+    assert statements == []
+
+    # Creating items for a known user doesn't re-insert the user row
+    store.create_todo({"title": "t", "tags": TAGS}, "u1")
+    assert statements.count("INSERT") == 1
+
+    # Items for a new user create the user row, which is then known
+    statements.clear()
+    store.create_note({"title": "n", "tags": TAGS}, "u2")
+    assert statements.count("INSERT") == 2
+    statements.clear()
+    assert store.get_or_create_user("u2").id == "u2"
+    assert statements == []
+
+
+def test_list_json_matches_to_dict(store):
+    import orjson
+
+    store.create_todo({"title": "t", "tags": TAGS, "due_date": "2030-01-01"}, "u1")
+    store.create_todo({"title": "other user", "tags": TAGS}, "u2")
+    store.create_note({"title": "n", "note": "body", "tags": TAGS}, "u1")
+    store.create_work({"name": "w", "start_date": "2030-01-01"}, "u1")
+
+    for kind in ("todos", "notes", "work"):
+        expected = getattr(store, f"list_{kind}")("u1")
+        body = getattr(store, f"list_{kind}_json")("u1")
+        assert len(expected) == 1
+        assert orjson.loads(body) == expected
+        # Same key order as to_dict()
+        assert list(orjson.loads(body)[0]) == list(expected[0])
+    assert store.list_todos_json("nobody") == b"[]"
@@ -0,0 +1,112 @@
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from todo_app import jwks_cache, jwt_auth
+
+
+@pytest.fixture()
+def providers(monkeypatch):
+    monkeypatch.setattr(jwt_auth, "_trusted_providers", [])
+    monkeypatch.setattr(jwt_auth, "_providers_by_issuer", {})
+    jwt_auth._add_provider("https://auth.example/web/", "web")
+    jwt_auth._add_provider("https://auth.example/mobile/", "mobile")
+
+
+def _token(claims):
+    return jwt.encode(claims, "x" * 32, algorithm="HS256")
+
+
+def test_token_only_validated_against_its_issuer(providers, monkeypatch):
+    tried = []
+
+    def fake_try_validate(token, jwks, audience, issuer):
+        tried.append(audience)
+        return {"sub": "u1"}
+
+    monkeypatch.setattr(jwt_auth, "_try_validate", fake_try_validate)
+
+    token = _token({"iss": "https://auth.example/mobile/", "sub": "u1"})
+    assert jwt_auth.validate_bearer_token(token) == {"sub": "u1"}
+    assert tried == ["mobile"]
+
+    tried.clear()
+    assert jwt_auth.validate_bearer_token(_token({"iss": "https://evil.example/", "sub": "u1"})) is None
+    assert jwt_auth.validate_bearer_token("not-a-jwt") is None
+    assert tried == []
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        pass
+
+
+def test_jwks_cache_revalidates_with_etag(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk["kid"] = "k1"
+    requests_seen = []
+
+    def fake_get(url, headers, timeout):
+        requests_seen.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"v1"':
+            return _FakeResponse(304)
+        return _FakeResponse(200, {"keys": [jwk]}, etag='"v1"')
+
+    monkeypatch.setattr(jwks_cache.requests, "get", fake_get)
+    cache = jwks_cache.JwksCache("https://auth.example/jwks/", lifespan=3600)
+
+    key = cache.get_key("k1")
+    token = jwt.encode({"sub": "u1"}, private_key, algorithm="RS256", headers={"kid": "k1"})
+    assert jwt.decode(token, key, algorithms=["RS256"]) == {"sub": "u1"}
+    assert cache.get_key("k1") is key
+    assert requests_seen == [None]
+
+    cache.expires_at = 0
+    assert cache.get_key("k1") is key
+    assert requests_seen == [None, '"v1"']
+
+    # Unknown kids refresh at most once per MIN_REFRESH_INTERVAL
+    with pytest.raises(jwt.PyJWKClientError):
+        cache.get_key("k2")
+    assert len(requests_seen) == 2
+
+
+def test_jwks_cache_serves_cached_keys_when_idp_is_down(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk["kid"] = "k1"
+    calls = []
+
+    def fake_get(url, headers, timeout):
+        calls.append(url)
+        return _FakeResponse(200, {"keys": [jwk]}, etag='"v1"')
+
+    monkeypatch.setattr(jwks_cache.requests, "get", fake_get)
+    cache = jwks_cache.JwksCache("https://auth.example/jwks/", lifespan=3600)
+    key = cache.get_key("k1")
+
+    def failing_get(url, headers, timeout):
+        calls.append(url)
+        raise jwks_cache.requests.ConnectionError("down")
+
+    monkeypatch.setattr(jwks_cache.requests, "get", failing_get)
+    cache.expires_at = 0
+    assert cache.get_key("k1") is key
+    # Backed off: the next lookups don't hit the IdP again
+    assert cache.get_key("k1") is key
+    assert len(calls) == 2
+
+    # With nothing cached, the failure is raised
+    empty = jwks_cache.JwksCache("https://auth.example/jwks/", lifespan=3600)
+    with pytest.raises(jwt.PyJWKClientConnectionError):
+        empty.get_key("k1")
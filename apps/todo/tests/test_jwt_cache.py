@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from todo_app import api, create_app, jwt_auth_cache
+from todo_app.jwt_auth_cache import TokenCache
+
+
+@pytest.fixture()
+def app(tmp_path):
+    app = create_app({
+        "DATA_FILE": str(tmp_path / "appdata.json"),
+        "WAL_FILE": str(tmp_path / "appdata.wal"),
+        "DEBUG": False,
+        "TESTING": True,
+    })
+    yield app
+    jwt_auth_cache.configure(enabled=False)
+
+
+def test_token_cache_ttl_and_exp():
+    cache = TokenCache(maxsize=2, ttl=60)
+    cache.put("a", {"sub": "u1"})
+    assert cache.get("a") == {"sub": "u1"}
+
+    # Already-expired tokens are not stored
+    cache.put("b", {"sub": "u2", "exp": time.time() - 1})
+    assert cache.get("b") is None
+
+    # Oldest entry is evicted past maxsize
+    cache.put("c", {"sub": "u3"})
+    cache.put("d", {"sub": "u4"})
+    assert cache.get("a") is None
+    assert len(cache) == 2
+
+
+def test_bearer_validation_cached_only_on_success(app, monkeypatch):
+    calls = []
+
+    def fake_validate(token):
+        calls.append(token)
+        return {"sub": "u1", "exp": time.time() + 300} if token == "good" else None
+
+    monkeypatch.setattr(api, "validate_bearer_token", fake_validate)
+    jwt_auth_cache.configure(enabled=True, ttl=60)
+
+    for token in ("good", "good", "bad", "bad"):
+        with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+            api.get_user_from_bearer()
+
+    assert calls == ["good", "bad", "bad"]
+
+
+def test_bearer_validated_once_per_request(app, monkeypatch):
+    calls = []
+
+    def fake_validate(token):
+        calls.append(token)
+        return {"sub": "u1"}
+
+    monkeypatch.setattr(api, "validate_bearer_token", fake_validate)
+    app.config["MULTIUSER"] = True
+
+    with app.test_request_context(headers={"Authorization": "Bearer good"}):
+        assert api.require_auth() is None
+        assert api.get_user_id() == "u1"
+        assert api.get_user_id() == "u1"
+
+    assert calls == ["good"]
+
+
+def test_api_rejects_unauthenticated_requests(app, monkeypatch):
+    monkeypatch.setattr(api, "validate_bearer_token", lambda token: None)
+    app.config["MULTIUSER"] = True
+    client = app.test_client()
+
+    for method, path in (("get", "/api/todos"), ("post", "/api/notes"), ("delete", "/api/work/x")):
+        resp = getattr(client, method)(path, headers={"Authorization": "Bearer bad"})
+        assert resp.status_code == 401
+        assert resp.get_json() == {"error": "authentication required"}
@@ -8,6 +8,7 @@ import structlog
 
 def setup_logging(service_name: str, log_level: str = "INFO", json_output: bool = False) -> None:
     """Configure structlog with service name context."""
+    level = getattr(logging, log_level.upper())
     shared_processors: list[structlog.types.Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
@@ -28,7 +29,8 @@ def setup_logging(service_name: str, log_level: str = "INFO", json_output: bool
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Calls below the configured level return before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
     )
 
@@ -45,13 +47,13 @@ def setup_logging(service_name: str, log_level: str = "INFO", json_output: bool
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
     root_logger.addHandler(handler)
-    root_logger.setLevel(getattr(logging, log_level.upper()))
+    root_logger.setLevel(level)
 
     # Bind service name to all log entries
     structlog.contextvars.clear_contextvars()
     structlog.contextvars.bind_contextvars(service=service_name)
 
 
-def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str | None = None) -> structlog.typing.FilteringBoundLogger:
     """Get a structlog logger instance."""
     return structlog.get_logger(name)